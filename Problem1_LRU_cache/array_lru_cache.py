@@ -0,0 +1,159 @@
+from array import array
+
+NIL = -1  # an "empty pointer" slot index
+
+
+class Array_LRU_Cache(object):
+    """A compact LRU Cache with the same get/set API as the LRU_Cache.
+
+    Instead of allocating a Node object (and a (key, value) tuple) per entry, the doubly linked list lives in
+    preallocated arrays indexed by a slot number: `keys` and `values` hold the entry, `prev` and `next` hold the slot
+    indices of the neighbouring entries. The Hash Map (python dictionary) maps a key to its slot. Unused slots are
+    chained into a free list through the `next` array, and the slot of an evicted entry is reused for the new one."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity  # max capacity of the LRU cache
+        self.cache = dict()  # a Hash Map from a key to its slot
+
+        size = capacity if type(capacity) == int and capacity > 0 else 0
+        self.keys = [None] * size
+        self.values = [None] * size
+        self.prev = array('l', [NIL]) * size  # slot of the less recently accessed entry
+        self.next = array('l', range(1, size + 1))  # slot of the more recently accessed entry, or of the next free slot
+        if size:
+            self.next[size - 1] = NIL
+
+        self.free = 0 if size else NIL  # first slot of the free list
+        self.head = NIL  # slot of the most recently accessed key
+        self.tail = NIL  # slot of the least recently accessed key
+
+    def _move_to_head(self, slot):
+        """Unlink a slot (which is not the head) from its position, and link it as the head"""
+        prev, next_ = self.prev, self.next
+
+        before, after = prev[slot], next_[slot]
+        if before == NIL:  # slot is a tail
+            self.tail = after
+        else:
+            next_[before] = after
+        prev[after] = before
+
+        prev[slot] = self.head
+        next_[slot] = NIL
+        next_[self.head] = slot
+        self.head = slot
+
+    def get(self, key, default=-1):
+        # Retrieve item from provided key. Return default (-1) if nonexistent.
+        slot = self.cache.get(key)
+        if slot is None:
+            return default
+
+        if slot != self.head:
+            self._move_to_head(slot)
+
+        return self.values[slot]
+
+    def set(self, key, value):
+        # Set the value if the key is not present in the cache. If the cache is at capacity remove the oldest item.
+
+        if type(self.capacity) != int or self.capacity <= 0:
+            print(f"LRU cache capacity is {self.capacity} and cannot hold any information.")
+            return
+
+        # If the KEY is in the dictionary, replace its value and re-order items
+        slot = self.cache.get(key)
+        if slot is not None:
+            self.values[slot] = value
+            if slot != self.head:
+                self._move_to_head(slot)
+            return
+
+        if len(self.cache) == self.capacity:
+            # evict the least recently used entry, and reuse its slot
+            slot = self.tail
+            del self.cache[self.keys[slot]]
+            self.tail = self.next[slot]
+            if self.tail == NIL:  # the evicted entry was the only one
+                self.head = NIL
+            else:
+                self.prev[self.tail] = NIL
+        else:
+            # take a slot from the free list
+            slot = self.free
+            self.free = self.next[slot]
+
+        self.keys[slot] = key
+        self.values[slot] = value
+
+        # link the slot as the most recent entry
+        self.prev[slot] = self.head
+        self.next[slot] = NIL
+        if self.head == NIL:  # empty cache
+            self.tail = slot
+        else:
+            self.next[self.head] = slot
+        self.head = slot
+
+        self.cache[key] = slot
+
+
+if __name__ == "__main__":
+    ### Test 1: provided test
+    print("--- Test #1")
+    our_cache = Array_LRU_Cache(5)
+
+    our_cache.set(1, 1)
+    our_cache.set(2, 2)
+    our_cache.set(3, 3)
+    our_cache.set(4, 4)
+
+    print(our_cache.get(1))  # 1
+    print(our_cache.get(2))  # 2
+    print(our_cache.get(9))  # -1
+
+    our_cache.set(5, 5)
+    our_cache.set(6, 6)
+
+    print(our_cache.get(3))  # -1
+
+    ### Test 2: LRU cache with capacity of 1
+    print("--- Test #2")
+    lru = Array_LRU_Cache(1)
+
+    lru.set(1, 1)
+    lru.set(10, 10)
+
+    print(lru.get(1))  # -1
+    print(lru.get(10))  # 10
+
+    ### Test 3: access order test
+    print("--- Test #3")
+    lru = Array_LRU_Cache(10)
+
+    for i in range(0, 10):
+        lru.set(i, i)
+    for i in range(9, -1, -1):
+        lru.get(i)
+
+    lru.set(100, 100)
+    lru.set(200, 200)
+
+    print(lru.get(9))  # -1
+    print(lru.get(0))  # 0
+
+    ### Test 4: evicted slots are reused, no slot is allocated beyond the capacity
+    print("--- Test #4")
+    lru = Array_LRU_Cache(3)
+    for i in range(100):
+        lru.set(i, i)
+    print(sorted(lru.cache.values()), len(lru.keys))  # [0, 1, 2] 3
+
+    ### Test 5 (edge case): zero capacity
+    print("--- Test #5")
+    lru = Array_LRU_Cache(0)
+
+    lru.set(1, 1)
+    print(lru.get(1))
+    # LRU cache capacity is 0 and cannot hold any information.
+    # -1
@@ -0,0 +1,107 @@
+import asyncio
+import inspect
+
+from problem_1 import LRU_Cache
+
+_MISSING = object()  # a miss marker, a loaded value may be -1
+
+
+class Async_Loading_Cache(object):
+    """An LRU_Cache for asyncio code, loading missing values with single-flight.
+
+    When many tasks miss on the same key at the same moment, `get_or_load` runs the loader only once: the first task
+    starts the load, the others await the same in-flight load. A loaded value is stored with the LRU_Cache `set`, so
+    the usual capacity, ttl, weight and eviction rules apply to it. A failed load is not cached: every waiting task
+    gets the exception, and the next `get_or_load` tries again."""
+
+    def __init__(self, capacity, **options):
+        self.lru = LRU_Cache(capacity, **options)  # options: ttl, weigher, max_weight, on_evict
+        self.in_flight = dict()  # key -> task of the running load
+
+    def get(self, key, default=-1):
+        return self.lru.get(key, default)
+
+    def set(self, key, value):
+        self.in_flight.pop(key, None)  # a running load must not overwrite this newer value
+        self.lru.set(key, value)
+
+    async def get_or_load(self, key, loader):
+        """Return the cached value of a key, or load it with `loader(key)` (a coroutine function, or a plain
+        function) and cache it."""
+        value = self.lru.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self.in_flight[key] = task
+
+        # shield: a cancelled caller does not cancel the load the other callers are waiting for
+        return await asyncio.shield(task)
+
+    async def _load(self, key, loader):
+        try:
+            value = loader(key)
+            if inspect.isawaitable(value):
+                value = await value
+        except BaseException:
+            if self.in_flight.get(key) is asyncio.current_task():
+                del self.in_flight[key]
+            raise
+
+        if self.in_flight.get(key) is asyncio.current_task():  # not overwritten by a `set` in the meantime
+            del self.in_flight[key]
+            self.lru.set(key, value)
+        return value
+
+
+if __name__ == "__main__":
+
+    async def main():
+        ### Test 1: concurrent misses on the same key run the loader once
+        print("--- Test #1")
+        cache = Async_Loading_Cache(10)
+        calls = []
+
+        async def loader(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key * 2
+
+        results = await asyncio.gather(*[cache.get_or_load(21, loader) for _ in range(100)])
+        print(set(results), calls)  # {42} [21]
+        print(cache.get(21))  # 42
+
+        ### Test 2: a failed load is not cached, and every waiting task gets the exception
+        print("--- Test #2")
+        attempts = []
+
+        async def failing_loader(key):
+            attempts.append(key)
+            await asyncio.sleep(0.01)
+            raise KeyError(key)
+
+        results = await asyncio.gather(*[cache.get_or_load("x", failing_loader) for _ in range(3)],
+                                       return_exceptions=True)
+        print([type(result).__name__ for result in results], attempts)  # ['KeyError', 'KeyError', 'KeyError'] ['x']
+        print(cache.get("x"), cache.in_flight)  # -1 {}
+
+        ### Test 3: loaded values go through the LRU eviction
+        print("--- Test #3")
+        evicted = []
+        cache = Async_Loading_Cache(2, on_evict=lambda key, value: evicted.append(key))
+        for key in range(4):
+            await cache.get_or_load(key, lambda key: key)  # a plain function loader
+        print(evicted)  # [0, 1]
+
+        ### Test 4: a value set while a load is running is not overwritten by the load
+        print("--- Test #4")
+        cache = Async_Loading_Cache(2)
+        load = asyncio.ensure_future(cache.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        cache.set("k", "newer")
+        await load
+        print(cache.get("k"))  # newer
+
+    asyncio.run(main())
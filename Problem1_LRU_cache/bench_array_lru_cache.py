@@ -0,0 +1,53 @@
+"""Memory and ops/sec comparison: the node-based LRU_Cache vs the array-backed Array_LRU_Cache.
+
+Usage: python bench_array_lru_cache.py [n_entries]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from array_lru_cache import Array_LRU_Cache
+from problem_1 import LRU_Cache
+
+
+def measure_memory(cache_class, n_entries):
+    """Bytes allocated by a cache filled with n_entries integer keys and values (the keys and values themselves
+    are allocated beforehand, so they are not counted)."""
+    keys = list(range(n_entries))
+
+    tracemalloc.start()
+    cache = cache_class(n_entries)
+    for key in keys:
+        cache.set(key, key)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return allocated
+
+
+def measure_ops(cache_class, capacity, n_ops):
+    """Mixed get/set (80% get) ops/sec over a key space 2x larger than the capacity"""
+    rnd = random.Random(0)
+    workload = [(rnd.randrange(2 * capacity), rnd.random() < 0.8) for _ in range(n_ops)]
+    cache = cache_class(capacity)
+
+    start = time.perf_counter()
+    for key, is_get in workload:
+        if is_get:
+            cache.get(key)
+        else:
+            cache.set(key, key)
+    elapsed = time.perf_counter() - start
+
+    return n_ops / elapsed
+
+
+if __name__ == "__main__":
+    n_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    print(f"{'engine':>16} {'bytes/entry':>12} {'ops/s':>12}")
+    for cache_class in (LRU_Cache, Array_LRU_Cache):
+        memory = measure_memory(cache_class, n_entries)
+        ops = measure_ops(cache_class, capacity=n_entries // 10, n_ops=n_entries)
+        print(f"{cache_class.__name__:>16} {memory / n_entries:>12.1f} {ops:>12,.0f}")
@@ -0,0 +1,64 @@
+"""Trace-replay harness: hit ratio of every cache policy on Zipfian and scan-heavy workloads.
+
+Every request of a trace is replayed as a read-through access: `get`, and `set` on a miss.
+
+Usage: python bench_cache_policies.py [capacity] [trace_length]
+"""
+import itertools
+import random
+import sys
+import time
+
+from cache_policies import POLICIES, make_cache
+
+_MISSING = object()
+
+
+def zipf_trace(n_keys, length, s=0.99, seed=0):
+    """Keys 0..n_keys-1, key i requested with a probability proportional to 1/(i+1)^s"""
+    rnd = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / (i + 1) ** s for i in range(n_keys)))
+    return rnd.choices(range(n_keys), cum_weights=cum_weights, k=length)
+
+
+def scan_trace(n_keys, length, scan_length, scan_every, s=0.99, seed=0):
+    """A Zipfian trace, interrupted every `scan_every` requests by a scan of `scan_length` keys that are never
+    requested again"""
+    zipf = zipf_trace(n_keys, length, s, seed)
+    cold_keys = itertools.count(n_keys)
+
+    trace = []
+    for i in range(0, length, scan_every):
+        trace.extend(zipf[i:i + scan_every])
+        trace.extend(itertools.islice(cold_keys, scan_length))
+    return trace
+
+
+def replay(cache, trace):
+    """Returns the hit ratio of a cache on a trace"""
+    hits = 0
+    for key in trace:
+        if cache.get(key, _MISSING) is _MISSING:
+            cache.set(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+if __name__ == "__main__":
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    n_keys = 100 * capacity
+
+    workloads = {
+        "zipf": zipf_trace(n_keys, length),
+        "zipf + scans": scan_trace(n_keys, length, scan_length=2 * capacity, scan_every=10 * capacity),
+    }
+
+    print(f"capacity={capacity}, {n_keys} keys, {length} Zipfian requests (s=0.99)")
+    print(f"{'policy':>10} " + " ".join(f"{name:>14}" for name in workloads) + f" {'time':>8}")
+    for policy in POLICIES:
+        start = time.perf_counter()
+        ratios = [replay(make_cache(policy, capacity), trace) for trace in workloads.values()]
+        elapsed = time.perf_counter() - start
+        print(f"{policy:>10} " + " ".join(f"{ratio:>14.2%}" for ratio in ratios) + f" {elapsed:>7.1f}s")
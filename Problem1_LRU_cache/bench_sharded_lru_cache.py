@@ -0,0 +1,56 @@
+"""Multi-threaded throughput benchmark: a single-lock LRU_Cache wrapper vs the Sharded_LRU_Cache.
+
+Usage: python bench_sharded_lru_cache.py [ops_per_thread]
+"""
+import random
+import sys
+import threading
+import time
+
+from sharded_lru_cache import Locked_LRU_Cache, Sharded_LRU_Cache
+
+
+def run(cache, n_threads, ops_per_thread, key_space):
+    """Run n_threads workers, each doing ops_per_thread mixed get/set operations (80% get). Returns ops/sec."""
+
+    # pre-generate the workload, so that random numbers are not part of the measurement
+    workloads = []
+    for n in range(n_threads):
+        rnd = random.Random(n)
+        workloads.append([(rnd.randrange(key_space), rnd.random() < 0.8) for _ in range(ops_per_thread)])
+
+    barrier = threading.Barrier(n_threads + 1)
+
+    def worker(workload):
+        barrier.wait()
+        for key, is_get in workload:
+            if is_get:
+                cache.get(key)
+            else:
+                cache.set(key, key)
+
+    threads = [threading.Thread(target=worker, args=(workload,)) for workload in workloads]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return n_threads * ops_per_thread / elapsed
+
+
+if __name__ == "__main__":
+    ops_per_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    capacity = 10000
+    key_space = 4 * capacity
+
+    print(f"capacity={capacity}, key space={key_space}, {ops_per_thread} ops per thread, 80% get / 20% set")
+    print(f"{'threads':>8} {'single lock ops/s':>20} {'sharded(16) ops/s':>20} {'speedup':>8}")
+
+    for n_threads in (1, 2, 4, 8):
+        locked = run(Locked_LRU_Cache(capacity), n_threads, ops_per_thread, key_space)
+        sharded = run(Sharded_LRU_Cache(capacity, shards=16), n_threads, ops_per_thread, key_space)
+        print(f"{n_threads:>8} {locked:>20,.0f} {sharded:>20,.0f} {sharded / locked:>8.2f}")
@@ -0,0 +1,359 @@
+from problem_1 import LRU_Cache
+
+HALVE = bytes(i >> 1 for i in range(256))  # translation table halving every byte-sized counter
+
+
+def _is_valid_capacity(capacity):
+    return type(capacity) == int and capacity > 0
+
+
+class TwoQ_Cache(object):
+    """2Q cache (Johnson & Shasha), with the same get/set API as the LRU_Cache.
+
+    A new key enters a small FIFO queue `a1in`, where hits do not change its position. When it falls out of `a1in`
+    only its key is remembered in a ghost queue `a1out`. A key that is set again while it is remembered in `a1out`
+    was accessed twice over a longer period of time, so it is moved to the main LRU queue `am`. Keys accessed only
+    once, like those of a batch scan, pass through `a1in` and never flush the hot keys kept in `am`."""
+
+    def __init__(self, capacity, in_ratio=0.25, out_ratio=0.5):
+        self.capacity = capacity  # max capacity of the cache, the ghost keys in a1out are not counted
+        size = capacity if _is_valid_capacity(capacity) else 0
+
+        self.in_capacity = max(1, int(size * in_ratio))  # a1in may grow beyond it only while am is empty
+        self.a1in = LRU_Cache(capacity)  # FIFO of recently added keys
+        self.a1out = LRU_Cache(max(1, int(size * out_ratio)))  # ghost keys evicted from a1in, without values
+        self.am = LRU_Cache(capacity)  # LRU of keys accessed again after leaving a1in
+
+    def get(self, key, default=-1):
+        # Retrieve item from provided key. Return default (-1) if nonexistent.
+        if key in self.am.cache:
+            return self.am.get(key)
+
+        if key in self.a1in.cache:  # FIFO: a hit does not change the order
+            return self.a1in.cache[key].get_val()
+
+        return default
+
+    def set(self, key, value):
+        if not _is_valid_capacity(self.capacity):
+            print(f"Cache capacity is {self.capacity} and cannot hold any information.")
+            return
+
+        if key in self.am.cache:
+            self.am.set(key, value)
+            return
+
+        if key in self.a1in.cache:  # replace the value in place, keeping its FIFO position
+            self.a1in.cache[key].val = (key, value)
+            return
+
+        self._reclaim()
+
+        if key in self.a1out.cache:  # a remembered key is accessed again: it is hot
+            self.a1out.remove(key)
+            self.am.set(key, value)
+        else:
+            self.a1in.set(key, value)
+
+    def _reclaim(self):
+        """Make room for a new entry if the cache is full"""
+        if len(self.a1in.cache) + len(self.am.cache) < self.capacity:
+            return
+
+        if len(self.a1in.cache) > self.in_capacity or not self.am.cache:
+            key, _ = self.a1in.pop_lru()
+            self.a1out.set(key, None)  # remember only the key
+        else:
+            self.am.pop_lru()
+
+
+class ARC_Cache(object):
+    """Adaptive Replacement Cache (Megiddo & Modha), with the same get/set API as the LRU_Cache.
+
+    Resident keys are split between `t1` (seen once recently) and `t2` (seen at least twice recently). Keys evicted
+    from them are remembered, without values, in the ghost lists `b1` and `b2`. A miss on a ghost key tells which
+    list was too small, and the target size `p` of `t1` adapts towards it. A scan only ever goes through `t1`, so
+    the frequently used keys in `t2` survive it."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity  # max capacity of the cache, the ghost keys are not counted
+        ghost_capacity = 2 * capacity if _is_valid_capacity(capacity) else capacity
+
+        self.p = 0  # target size of t1
+        self.t1 = LRU_Cache(capacity)
+        self.t2 = LRU_Cache(capacity)
+        self.b1 = LRU_Cache(ghost_capacity)
+        self.b2 = LRU_Cache(ghost_capacity)
+
+    def get(self, key, default=-1):
+        # Retrieve item from provided key. Return default (-1) if nonexistent.
+        if key in self.t1.cache:  # seen for the second time, move to t2
+            value = self.t1.remove(key)
+            self.t2.set(key, value)
+            return value
+
+        if key in self.t2.cache:
+            return self.t2.get(key)
+
+        return default
+
+    def set(self, key, value):
+        if not _is_valid_capacity(self.capacity):
+            print(f"Cache capacity is {self.capacity} and cannot hold any information.")
+            return
+
+        c = self.capacity
+        t1, t2, b1, b2 = self.t1, self.t2, self.b1, self.b2
+
+        if key in t1.cache:
+            t1.remove(key)
+            t2.set(key, value)
+            return
+
+        if key in t2.cache:
+            t2.set(key, value)
+            return
+
+        if key in b1.cache:  # t1 was too small, grow its target size
+            self.p = min(c, self.p + max(len(b2.cache) / len(b1.cache), 1))
+            self._replace(in_b2=False)
+            b1.remove(key)
+            t2.set(key, value)
+            return
+
+        if key in b2.cache:  # t2 was too small, shrink the target size of t1
+            self.p = max(0, self.p - max(len(b1.cache) / len(b2.cache), 1))
+            self._replace(in_b2=True)
+            b2.remove(key)
+            t2.set(key, value)
+            return
+
+        # A new key: keep the resident and ghost keys within their bounds
+        l1 = len(t1.cache) + len(b1.cache)
+        if l1 == c:
+            if len(t1.cache) < c:
+                b1.pop_lru()
+                self._replace(in_b2=False)
+            else:
+                t1.pop_lru()
+        else:
+            total = l1 + len(t2.cache) + len(b2.cache)
+            if total >= c:
+                if total == 2 * c:
+                    b2.pop_lru()
+                self._replace(in_b2=False)
+
+        t1.set(key, value)
+
+    def _replace(self, in_b2):
+        """If the cache is full, move the LRU key of t1 or t2 to its ghost list, depending on the target size p"""
+        if len(self.t1.cache) + len(self.t2.cache) < self.capacity:
+            return
+
+        t1_size = len(self.t1.cache)
+        if t1_size and (t1_size > self.p or (in_b2 and t1_size == self.p) or not self.t2.cache):
+            key, _ = self.t1.pop_lru()
+            self.b1.set(key, None)
+        else:
+            key, _ = self.t2.pop_lru()
+            self.b2.set(key, None)
+
+
+class Count_Min_Sketch(object):
+    """An approximate frequency counter using a fixed amount of memory.
+
+    A key increments one small counter (max 15) in each of `depth` rows. Its estimated frequency is the minimum of
+    these counters: collisions can only make it higher, never lower. After `sample_size` increments all counters are
+    halved, so the frequencies of keys that stopped being popular decay over time."""
+
+    def __init__(self, width, depth=4, max_count=15, sample_size=None):
+        self.width = 1 << max(4, (width - 1).bit_length())  # power of two, to compute indices with a bit mask
+        self.mask = self.width - 1
+        self.depth = depth
+        self.max_count = max_count
+        self.sample_size = sample_size or 10 * width
+        self.additions = 0
+        self.rows = [bytearray(self.width) for _ in range(depth)]
+
+    def _indices(self, key):
+        # double hashing: the i-th row uses h1 + i*h2
+        h = (hash(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) & self.mask for i in range(self.depth)]
+
+    def increment(self, key):
+        for row, index in zip(self.rows, self._indices(key)):
+            if row[index] < self.max_count:
+                row[index] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:  # aging
+            self.rows = [row.translate(HALVE) for row in self.rows]
+            self.additions //= 2
+
+    def estimate(self, key):
+        return min(row[index] for row, index in zip(self.rows, self._indices(key)))
+
+
+class W_TinyLFU_Cache(object):
+    """W-TinyLFU cache (Einziger, Friedman & Manes), with the same get/set API as the LRU_Cache.
+
+    New keys enter a small LRU `window` (1% of the capacity). A key evicted from the window is a candidate for the
+    main cache, which is a segmented LRU: `probation` for keys not hit since they were admitted, `protected` for
+    keys hit again. When the main cache is full, the candidate is admitted only if its estimated frequency, kept in a
+    Count_Min_Sketch over all accesses (get and set), is higher than that of the probation LRU victim. Keys of a scan
+    are accessed once, so they are rejected instead of flushing the frequently used keys."""
+
+    def __init__(self, capacity, window_ratio=0.01, protected_ratio=0.8):
+        self.capacity = capacity  # max capacity of the cache
+        size = capacity if _is_valid_capacity(capacity) else 0
+
+        self.window_capacity = max(1, int(size * window_ratio))
+        self.main_capacity = max(0, size - self.window_capacity)
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+
+        self.window = LRU_Cache(capacity)
+        self.probation = LRU_Cache(capacity)
+        self.protected = LRU_Cache(capacity)
+        self.sketch = Count_Min_Sketch(4 * max(size, 1), sample_size=10 * max(size, 1))
+
+    def get(self, key, default=-1):
+        # Retrieve item from provided key. Return default (-1) if nonexistent.
+        self.sketch.increment(key)
+
+        if key in self.window.cache:
+            return self.window.get(key)
+
+        if key in self.protected.cache:
+            return self.protected.get(key)
+
+        if key in self.probation.cache:
+            value = self.probation.remove(key)
+            self._protect(key, value)
+            return value
+
+        return default
+
+    def set(self, key, value):
+        if not _is_valid_capacity(self.capacity):
+            print(f"Cache capacity is {self.capacity} and cannot hold any information.")
+            return
+
+        self.sketch.increment(key)
+
+        if key in self.window.cache:
+            self.window.set(key, value)
+            return
+
+        if key in self.protected.cache:
+            self.protected.set(key, value)
+            return
+
+        if key in self.probation.cache:
+            self.probation.remove(key)
+            self._protect(key, value)
+            return
+
+        self.window.set(key, value)
+        if len(self.window.cache) > self.window_capacity:
+            self._admit(*self.window.pop_lru())
+
+    def _protect(self, key, value):
+        """Move a key hit in probation to protected, demoting the protected LRU key back if protected overflows"""
+        self.protected.set(key, value)
+        if len(self.protected.cache) > self.protected_capacity:
+            self.probation.set(*self.protected.pop_lru())
+
+    def _admit(self, key, value):
+        """Admit a candidate evicted from the window into the main cache, or drop it"""
+        if len(self.probation.cache) + len(self.protected.cache) < self.main_capacity:
+            self.probation.set(key, value)
+            return
+
+        if not self.probation.cache:  # no main cache (capacity of 1)
+            return
+
+        victim = self.probation.tail.get_key()
+        if self.sketch.estimate(key) > self.sketch.estimate(victim):
+            self.probation.pop_lru()
+            self.probation.set(key, value)
+
+
+POLICIES = {
+    "lru": LRU_Cache,
+    "2q": TwoQ_Cache,
+    "arc": ARC_Cache,
+    "w-tinylfu": W_TinyLFU_Cache,
+}
+
+
+def make_cache(policy, capacity):
+    """Create a cache of a given capacity with one of the POLICIES"""
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown cache policy '{policy}', expected one of {list(POLICIES)}")
+    return POLICIES[policy](capacity)
+
+
+if __name__ == "__main__":
+    ### Test 1: every policy follows the LRU_Cache get/set semantics
+    print("--- Test #1")
+    for policy in POLICIES:
+        cache = make_cache(policy, 5)
+        cache.set(1, 1)
+        cache.set(2, 2)
+        cache.set(1, 10)
+        print(policy, cache.get(1), cache.get(2), cache.get(9))
+    # lru 10 2 -1
+    # 2q 10 2 -1
+    # arc 10 2 -1
+    # w-tinylfu 10 2 -1
+
+    ### Test 2: no policy holds more entries than its capacity
+    print("--- Test #2")
+    for policy in POLICIES:
+        cache = make_cache(policy, 10)
+        for i in range(1000):
+            cache.set(i % 37, i)
+            cache.get(i % 13)
+        resident = sum(1 for i in range(37) if cache.get(i, None) is not None)
+        print(policy, resident <= 10)  # True
+
+    ### Test 3: a scan of cold keys does not flush the hot keys
+    print("--- Test #3")
+
+    def access(cache, key):
+        if cache.get(key, None) is None:
+            cache.set(key, key)
+
+    for policy in POLICIES:
+        cache = make_cache(policy, 100)
+        cold_key = 0
+        for _ in range(50):  # 20 hot keys accessed repeatedly, mixed with some cold keys
+            for hot_key in range(20):
+                access(cache, f"hot {hot_key}")
+            for _ in range(10):
+                cold_key += 1
+                access(cache, cold_key)
+        for _ in range(1000):  # a scan over cold keys, accessed once
+            cold_key += 1
+            access(cache, cold_key)
+        print(policy, sum(1 for hot_key in range(20) if cache.get(f"hot {hot_key}", None) is not None))
+    # lru 0
+    # 2q 20
+    # arc 20
+    # w-tinylfu 20
+
+    ### Test 4 (edge case): zero capacity
+    print("--- Test #4")
+    cache = make_cache("arc", 0)
+    cache.set(1, 1)
+    print(cache.get(1))
+    # Cache capacity is 0 and cannot hold any information.
+    # -1
+
+    ### Test 5 (edge case): unknown policy
+    print("--- Test #5")
+    try:
+        make_cache("mru", 5)
+    except ValueError as e:
+        print(e)  # Unknown cache policy 'mru', expected one of ['lru', '2q', 'arc', 'w-tinylfu']
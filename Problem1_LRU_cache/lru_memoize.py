@@ -0,0 +1,122 @@
+import time
+from collections import namedtuple
+from functools import wraps
+
+from problem_1 import LRU_Cache
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_MISSING = object()  # a miss marker, the cached function itself may return -1
+_KWARGS_MARK = object()  # separates positional from keyword arguments in a key
+
+
+def make_key(args, kwargs):
+    """Build a hashable cache key from positional and keyword arguments. Keyword arguments are sorted, so the order
+    in which they are passed does not matter."""
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return key
+
+
+def lru_memoize(capacity, ttl=None):
+    """A decorator memoizing a pure function in an LRU_Cache of a given capacity.
+
+    With `ttl` (in seconds), a cached result is recomputed once it is older than `ttl` seconds. The decorated
+    function gets `cache_info()` and `cache_clear()` methods, the same as with `functools.lru_cache`.
+
+    Args:
+      capacity(int): max number of cached results
+      ttl(float): time to live of a cached result in seconds, None - results never expire
+    """
+
+    def decorator(func):
+        cache = LRU_Cache(capacity, ttl=ttl)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+
+            result = cache.get(key, _MISSING)
+            if result is not _MISSING:
+                return result
+
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+            return result
+
+        def cache_info():
+            return CacheInfo(cache.hits, cache.misses, cache.capacity, len(cache.cache))
+
+        def cache_clear():
+            nonlocal cache
+            cache = LRU_Cache(capacity, ttl=ttl)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+    ### Test 1: results are cached
+    print("--- Test #1")
+    calls = []
+
+    @lru_memoize(capacity=2)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    print(square(3), square(3), square(4))  # 9 9 16
+    print(calls)  # [3, 4]
+    print(square.cache_info())  # CacheInfo(hits=1, misses=2, maxsize=2, currsize=2)
+
+    ### Test 2: least recently used results are evicted
+    print("--- Test #2")
+    square(5)  # evicts 3
+    square(3)
+    print(calls)  # [3, 4, 5, 3]
+
+    ### Test 3: keyword argument order does not matter
+    print("--- Test #3")
+
+    @lru_memoize(capacity=5)
+    def power(base, exp):
+        return base ** exp
+
+    power(base=2, exp=10)
+    power(exp=10, base=2)
+    print(power.cache_info().hits)  # 1
+
+    ### Test 4: results expire after ttl seconds
+    print("--- Test #4")
+    calls = []
+
+    @lru_memoize(capacity=5, ttl=0.05)
+    def now(x):
+        calls.append(x)
+        return time.monotonic()
+
+    first = now(1)
+    print(now(1) == first)  # True
+    time.sleep(0.1)
+    print(now(1) == first)  # False
+    print(calls)  # [1, 1]
+
+    ### Test 5: a function returning -1 is cached too
+    print("--- Test #5")
+
+    @lru_memoize(capacity=5)
+    def minus_one():
+        return -1
+
+    minus_one()
+    minus_one()
+    print(minus_one.cache_info().hits)  # 1
+
+    ### Test 6: cache_clear empties the cache and resets the statistics
+    print("--- Test #6")
+    minus_one.cache_clear()
+    print(minus_one.cache_info())  # CacheInfo(hits=0, misses=0, maxsize=5, currsize=0)
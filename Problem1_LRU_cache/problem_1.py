@@ -1,10 +1,15 @@
+import time
+
+
 class Node(object):
     """An instance of a node of a doubly-linked list. """
 
-    def __init__(self, val):
+    def __init__(self, val, timestamp=None, weight=0):
         self.prev = None
         self.next = None
         self.val = val  # (key,value) pair
+        self.timestamp = timestamp  # time of the last set, only tracked when the cache has a ttl
+        self.weight = weight  # weight of the entry, only tracked when the cache has a weigher
 
     def get_key(self):
         return self.val[0]
@@ -14,20 +19,88 @@ class Node(object):
 
 
 class LRU_Cache(object):
-    """LRU Cache implemented using a Hash Map (python dictionary) and a Doubly Linked List. """
+    """LRU Cache implemented using a Hash Map (python dictionary) and a Doubly Linked List.
+
+    With an optional `ttl` (in seconds), an entry expires `ttl` seconds after it was last set. Expired entries are
+    treated as misses, and are dropped lazily: when they are looked up by `get`, or when `set` needs room.
+
+    With a `weigher(key, value)` callable and a `max_weight`, the cache is bounded by the total weight of its entries
+    (e.g. their size in bytes) instead of, or on top of, their number: least recently used entries are evicted until
+    the total weight fits. The capacity can then be None to not limit the number of entries.
+
+    The cache counts its hits, misses, evictions and insertions. Entries dropped by the cache itself (to make room,
+    or because they expired) are evictions, and are passed to the optional `on_evict(key, value)` callback."""
+
+    def __init__(self, capacity, ttl=None, weigher=None, max_weight=None, on_evict=None):
+        if (weigher is None) != (max_weight is None):
+            raise ValueError("weigher and max_weight must be provided together")
 
-    def __init__(self, capacity):
         self.capacity = capacity  # max capacity of the LRU cache
+        self.ttl = ttl  # time to live of an entry in seconds, None - entries never expire
+        self.weigher = weigher  # weigher(key, value) returns the weight of an entry
+        self.max_weight = max_weight  # max total weight of the LRU cache, None - entries are not weighted
+        self.total_weight = 0  # current total weight of all entries
+        self.on_evict = on_evict  # on_evict(key, value) is called for every evicted entry
         self.cache = dict()  # a Hash Map to store the key-valued pairs
 
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.insertions = 0
+
         # init head and tail of a doubly linked list
         self.head = None  # the most recently accessed key
         self.tail = None  # the least recently accessed key
 
-    def get(self, key):
-        # Retrieve item from provided key. Return -1 if nonexistent.
+    def _is_expired(self, node):
+        return self.ttl is not None and time.monotonic() - node.timestamp > self.ttl
+
+    def _is_full(self, weight=0):
+        """Checks if an entry of a given weight does not fit without evicting"""
+        if len(self.cache) == self.capacity:
+            return True
+        return self.max_weight is not None and self.total_weight + weight > self.max_weight
+
+    def _unlink(self, node):
+        """Unlink a node from the doubly linked list"""
+        if node.prev:  # is not None
+            node.prev.next = node.next
+        else:  # node is a tail
+            self.tail = node.next
+
+        if node.next:  # is not None
+            node.next.prev = node.prev
+        else:  # node is a head
+            self.head = node.prev
+
+        node.prev = node.next = None
+
+    def _remove(self, node):
+        """Unlink a node from the doubly linked list, and remove its key from the Hash Map"""
+        self._unlink(node)
+        self.total_weight -= node.weight
+        del self.cache[node.get_key()]
+
+    def _evict(self, node):
+        """Remove a node dropped by the cache itself, and report it"""
+        self._remove(node)
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(node.get_key(), node.get_val())
+
+    def get(self, key, default=-1):
+        # Retrieve item from provided key. Return default (-1) if nonexistent or expired.
         if key not in self.cache.keys():
-            return -1
+            self.misses += 1
+            return default
+
+        if self._is_expired(self.cache[key]):
+            self._evict(self.cache[key])
+            self.misses += 1
+            return default
+
+        self.hits += 1
 
         # If the key is the most recently occurring one, return the value, do not change Doubly-Linked List
         if self.cache[key].next is None:
@@ -52,40 +125,60 @@ class LRU_Cache(object):
     def set(self, key, value):
         # Set the value if the key is not present in the cache. If the cache is at capacity remove the oldest item.
 
-        if type(self.capacity) != int or self.capacity <= 0 :
+        unbounded = self.capacity is None and self.max_weight is not None  # only the total weight is limited
+        if not unbounded and (type(self.capacity) != int or self.capacity <= 0):
             print(f"LRU cache capacity is {self.capacity} and cannot hold any information.")
             return
 
+        timestamp = time.monotonic() if self.ttl is not None else None
+        weight = self.weigher(key, value) if self.weigher is not None else 0
+
+        if self.max_weight is not None and weight > self.max_weight:
+            print(f"Entry weight {weight} exceeds the LRU cache max weight {self.max_weight}, entry is rejected.")
+            if key in self.cache.keys():  # do not keep serving the outdated value
+                self._remove(self.cache[key])
+            return
+
         # If the KEY is in the dictionary, we don't need to worry about LRU_cache capacity, just re-order items
         if key in self.cache.keys():
 
-            # if KEY is already most recently accessed one, replace value and finish
-            if self.cache[key].next is None:
-                self.cache[key].val = (key, value)
-                return
-
             # Extract the node, and replace its value
             tmp_node = self.cache[key]
             tmp_node.val = (key, value)
-
-            if tmp_node.prev:  # is not None
-                tmp_node.prev.next = tmp_node.next
-            else:  # tmp_node is a tail
-                self.tail = tmp_node.next
-
-            tmp_node.next.prev = tmp_node.prev
-            tmp_node.next = None  # most recent node does not have a next Node
-            self.head.next = tmp_node  # moves the head
-            self.head = tmp_node
+            tmp_node.timestamp = timestamp
+            self.total_weight += weight - tmp_node.weight
+            tmp_node.weight = weight
+
+            # if KEY is not the most recently accessed one, move it to the head
+            if tmp_node.next:  # is not None
+                if tmp_node.prev:  # is not None
+                    tmp_node.prev.next = tmp_node.next
+                else:  # tmp_node is a tail
+                    self.tail = tmp_node.next
+
+                tmp_node.next.prev = tmp_node.prev
+                tmp_node.next = None  # most recent node does not have a next Node
+                tmp_node.prev = self.head
+                self.head.next = tmp_node  # moves the head
+                self.head = tmp_node
+
+            # a heavier value may not fit anymore, evict least recently used entries (never the head, it fits alone)
+            while self.max_weight is not None and self.total_weight > self.max_weight:
+                self._evict(self.tail)
 
             return
 
-        # The key is not present, we need to check capacity: remove least recently used entry first
-        if self.capacity == len(self.cache):
-            del self.cache[self.tail.get_key()]
-            self.tail = self.tail.next
+        # The key is not present, we need to check capacity: drop expired entries at the tail first, and if that
+        # did not make room, remove least recently used entries
+        if self._is_full(weight):
+            while self.tail and self._is_expired(self.tail):
+                self._evict(self.tail)
+            while self._is_full(weight):
+                self._evict(self.tail)
 
-        tmp_node = Node((key, value))
+        tmp_node = Node((key, value), timestamp, weight)
+        self.total_weight += weight
+        self.insertions += 1
 
         # If we initialize, we put a value in the hash map and set the head equal to tail tail,
         if len(self.cache) == 0:
@@ -100,6 +193,112 @@ class LRU_Cache(object):
         # and add it to the HashMap
         self.cache[key] = self.head
 
+    def get_many(self, keys, default=-1):
+        # Retrieve items for a batch of keys, returns a list of values (default (-1) for nonexistent keys).
+        # The doubly linked list is re-ordered once for the whole batch, the later a key in the batch the more recent.
+        values = []
+        hit_nodes = dict()  # key -> node of the keys that were hit, in the order of their last occurrence
+
+        for key in keys:
+            node = self.cache.get(key)
+
+            if node is not None and self._is_expired(node):
+                self._evict(node)
+                hit_nodes.pop(key, None)
+                node = None
+
+            if node is None:
+                self.misses += 1
+                values.append(default)
+                continue
+
+            self.hits += 1
+            hit_nodes.pop(key, None)
+            hit_nodes[key] = node
+            values.append(node.get_val())
+
+        self._move_to_head(list(hit_nodes.values()))
+        return values
+
+    def set_many(self, items):
+        # Set a batch of (key, value) pairs (or a dictionary), the later a key in the batch the more recent.
+        # Without a ttl or a weigher, and with a batch that fits the capacity, the doubly linked list is re-ordered
+        # once for the whole batch, and the evictions are done up front.
+        if hasattr(items, "items"):
+            items = items.items()
+
+        batch = dict()  # the last value of each key, in the order of their last occurrence
+        for key, value in items:
+            batch.pop(key, None)
+            batch[key] = value
+
+        if (type(self.capacity) != int or len(batch) > self.capacity
+                or self.ttl is not None or self.weigher is not None):
+            for key, value in batch.items():
+                self.set(key, value)
+            return
+
+        nodes = []
+        new_entries = 0
+        for key, value in batch.items():
+            node = self.cache.get(key)
+            if node is None:
+                node = Node((key, value))
+                new_entries += 1
+            else:
+                node.val = (key, value)
+                self._unlink(node)
+            nodes.append(node)
+
+        # the batch nodes are out of the list, so only the entries outside of the batch are evicted
+        while len(self.cache) + new_entries > self.capacity:
+            self._evict(self.tail)
+
+        self._move_to_head(nodes)
+        for node in nodes:
+            self.cache[node.get_key()] = node
+        self.insertions += new_entries
+
+    def _move_to_head(self, nodes):
+        """Put a sequence of nodes at the head of the doubly linked list, the last node becomes the head"""
+        if not nodes:
+            return
+
+        for node in nodes:
+            if node.prev or node.next or self.head is node:  # still linked
+                self._unlink(node)
+
+        # chain the nodes together, then attach the chain after the current head
+        for prev_node, next_node in zip(nodes, nodes[1:]):
+            prev_node.next = next_node
+            next_node.prev = prev_node
+
+        nodes[0].prev = self.head
+        if self.head:  # is not None
+            self.head.next = nodes[0]
+        else:  # empty list
+            self.tail = nodes[0]
+        nodes[-1].next = None
+        self.head = nodes[-1]
+
+    def remove(self, key, default=-1):
+        # Remove the key from the cache and return its value. Return default (-1) if nonexistent.
+        if key not in self.cache.keys():
+            return default
+
+        node = self.cache[key]
+        self._remove(node)
+        return node.get_val()
+
+    def pop_lru(self):
+        # Remove the least recently used item and return its (key, value) pair. Return None if the cache is empty.
+        if self.tail is None:
+            return None
+
+        node = self.tail
+        self._remove(node)
+        return node.val
+
 
 if __name__ == "__main__":
     ### Test 1 : LRU cache with capacity of 1
@@ -174,4 +373,56 @@ if __name__ == "__main__":
     # LRU cache capacity is None and cannot hold any information.
     # -1
 
+    ### TEST 7: entries expire after ttl seconds
+    print("--- TEST 7")
+    lru = LRU_Cache(3, ttl=0.05)
+
+    lru.set(1, 1)
+    print(lru.get(1))
+    # 1
+    time.sleep(0.1)
+    print(lru.get(1))
+    # -1
+    print(len(lru.cache))
+    # 0
+
+    ### TEST 8: the cache is bounded by the total weight of its entries
+    print("--- TEST 8")
+    lru = LRU_Cache(None, weigher=lambda key, value: len(value), max_weight=10)
+
+    lru.set("a", "xxxx")
+    lru.set("b", "xxxx")
+    print(lru.total_weight)
+    # 8
+    lru.set("c", "xxxx")  # evicts "a"
+    print(lru.get("a"), lru.get("b"), lru.total_weight)
+    # -1 xxxx 8
+    lru.set("d", "x" * 11)
+    print(lru.get("d"))
+    # Entry weight 11 exceeds the LRU cache max weight 10, entry is rejected.
+    # -1
+
+    ### TEST 9: batch get and set
+    print("--- TEST 9")
+    lru = LRU_Cache(3)
+
+    lru.set_many([(1, 1), (2, 2), (3, 3)])
+    print(lru.get_many([3, 1, 9]))
+    # [3, 1, -1]
+    lru.set_many({4: 4})  # 2 is the least recently used one
+    print(lru.get_many([1, 2, 3, 4]))
+    # [1, -1, 3, 4]
+
+    ### TEST 10: statistics and the eviction callback
+    print("--- TEST 10")
+    evicted = []
+    lru = LRU_Cache(2, on_evict=lambda key, value: evicted.append(key))
+
+    for i in range(5):
+        lru.set(i, i)
+    lru.get(4)
+    lru.get(0)
+    print(lru.hits, lru.misses, lru.evictions, lru.insertions, evicted)
+    # 1 1 3 5 [0, 1, 2]
+
 
@@ -0,0 +1,116 @@
+import threading
+
+from problem_1 import LRU_Cache
+
+
+class Locked_LRU_Cache(object):
+    """A single LRU_Cache guarded by one global lock. Every get/set from every thread waits on the same lock.
+    Used as a baseline for the Sharded_LRU_Cache."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.lru = LRU_Cache(capacity)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.lru.get(key)
+
+    def set(self, key, value):
+        with self.lock:
+            self.lru.set(key, value)
+
+
+class Sharded_LRU_Cache(object):
+    """A thread-safe LRU cache that splits keys across N independent LRU_Cache shards, each guarded by its own lock.
+
+    A key always lands in the same shard (chosen by its hash), so threads working on keys in different shards never
+    wait for each other. The total capacity is divided between the shards, and each shard evicts its own least
+    recently used entry, i.e. the eviction order is LRU per shard rather than across the whole cache."""
+
+    def __init__(self, capacity, shards=8):
+        self.capacity = capacity  # max capacity of all shards together
+
+        if type(capacity) == int and capacity > 0 and type(shards) == int and shards > 0:
+            shards = min(shards, capacity)  # every shard must be able to hold at least one entry
+            base, extra = divmod(capacity, shards)
+            capacities = [base + 1 if i < extra else base for i in range(shards)]
+        else:  # invalid capacity: a single shard reports it the same way the LRU_Cache does
+            capacities = [capacity]
+
+        self.shards = [LRU_Cache(shard_capacity) for shard_capacity in capacities]
+        self.locks = [threading.Lock() for _ in capacities]
+
+    def shard_capacity(self, index):
+        """Capacity of a single shard"""
+        return self.shards[index].capacity
+
+    def _index(self, key):
+        return hash(key) % len(self.shards)
+
+    def get(self, key):
+        # Retrieve item from provided key. Return -1 if nonexistent.
+        index = self._index(key)
+        with self.locks[index]:
+            return self.shards[index].get(key)
+
+    def set(self, key, value):
+        # Set the value in the key's shard. If the shard is at capacity, the shard removes its oldest item.
+        index = self._index(key)
+        with self.locks[index]:
+            self.shards[index].set(key, value)
+
+
+if __name__ == "__main__":
+    ### Test 1: the same get/set semantics as LRU_Cache
+    print("--- Test #1")
+    cache = Sharded_LRU_Cache(5, shards=1)
+
+    cache.set(1, 1)
+    cache.set(2, 2)
+    cache.set(3, 3)
+    cache.set(4, 4)
+
+    print(cache.get(1))  # 1
+    print(cache.get(2))  # 2
+    print(cache.get(9))  # -1
+
+    cache.set(5, 5)
+    cache.set(6, 6)
+
+    print(cache.get(3))  # -1
+
+    ### Test 2: capacity is split between shards
+    print("--- Test #2")
+    cache = Sharded_LRU_Cache(10, shards=4)
+    print([cache.shard_capacity(i) for i in range(len(cache.shards))])  # [3, 3, 2, 2]
+
+    ### Test 3 (edge case): fewer entries than shards
+    print("--- Test #3")
+    cache = Sharded_LRU_Cache(2, shards=8)
+    print(len(cache.shards))  # 2
+
+    ### Test 4 (edge case): zero capacity
+    print("--- Test #4")
+    cache = Sharded_LRU_Cache(0)
+    cache.set(1, 1)
+    print(cache.get(1))
+    # LRU cache capacity is 0 and cannot hold any information.
+    # -1
+
+    ### Test 5: concurrent writers and readers do not lose or corrupt entries
+    print("--- Test #5")
+    cache = Sharded_LRU_Cache(1000, shards=8)
+
+    def worker(offset):
+        for i in range(offset, offset + 250):
+            cache.set(i, i)
+            cache.get(i)
+
+    threads = [threading.Thread(target=worker, args=(n * 250,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(all(cache.get(i) == i for i in range(1000)))  # True
@@ -0,0 +1,182 @@
+import mmap
+import os
+import pickle
+
+from problem_1 import LRU_Cache
+
+_MISSING = object()  # a miss marker, a cached value may be -1
+
+
+class Spill_File(object):
+    """An append-only file of pickled values, read through a memory map.
+
+    An in-memory index maps a key to the (offset, length) of its record. Removing or overwriting a key only drops it
+    from the index, which leaves its record as dead space in the file. Once the dead space is more than
+    `compact_ratio` of the file (and the file is at least `min_compact_size` bytes), the live records are copied
+    into a new file that replaces the old one."""
+
+    def __init__(self, path, compact_ratio=0.5, min_compact_size=1 << 20):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.min_compact_size = min_compact_size
+
+        self.file = open(path, "w+b")
+        self.index = dict()  # key -> (offset, length) of its record
+        self.size = 0  # bytes written to the file
+        self.dead_bytes = 0  # bytes of records that are not in the index anymore
+
+        self.map = None  # read-only memory map of the file, re-created when it grows
+        self.mapped_size = 0
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def append(self, key, value):
+        """Write a value at the end of the file"""
+        record = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.discard(key)
+
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(record)
+        self.index[key] = (self.size, len(record))
+        self.size += len(record)
+
+    def pop(self, key, default=None):
+        """Remove a key and return its value"""
+        if key not in self.index:
+            return default
+
+        offset, length = self.index[key]
+        value = pickle.loads(self._read(offset, length))
+        self.discard(key)
+        return value
+
+    def discard(self, key):
+        """Remove a key, its record becomes dead space"""
+        if key not in self.index:
+            return
+
+        _, length = self.index.pop(key)
+        self.dead_bytes += length
+
+        if self.size >= self.min_compact_size and self.dead_bytes > self.compact_ratio * self.size:
+            self.compact()
+
+    def _read(self, offset, length):
+        if offset + length > self.mapped_size:  # the record was written after the file was mapped
+            self.file.flush()
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mapped_size = len(self.map)
+
+        return self.map[offset:offset + length]
+
+    def compact(self):
+        """Copy the live records into a new file, and replace the old file with it"""
+        tmp_path = self.path + ".compact"
+        index = dict()
+        size = 0
+
+        with open(tmp_path, "wb") as tmp_file:
+            for key, (offset, length) in self.index.items():
+                tmp_file.write(self._read(offset, length))
+                index[key] = (size, length)
+                size += length
+
+        self._close_file()
+        os.replace(tmp_path, self.path)
+
+        self.file = open(self.path, "r+b")
+        self.index = index
+        self.size = size
+        self.dead_bytes = 0
+
+    def _close_file(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+            self.mapped_size = 0
+        self.file.close()
+
+    def close(self, delete=True):
+        self._close_file()
+        if delete:
+            os.remove(self.path)
+
+
+class Two_Tier_LRU_Cache(object):
+    """An LRU_Cache with a second, on-disk tier for evicted entries.
+
+    Entries evicted from memory are spilled into a Spill_File instead of being deleted. A `get` that misses in memory
+    but hits on disk promotes the entry back into memory (which may spill another entry). Only entries evicted to
+    make room are spilled, the memory tier is bounded by its capacity and optional weight."""
+
+    def __init__(self, capacity, path, weigher=None, max_weight=None, **spill_options):
+        self.disk = Spill_File(path, **spill_options)  # compact_ratio, min_compact_size
+        self.lru = LRU_Cache(capacity, weigher=weigher, max_weight=max_weight, on_evict=self.disk.append)
+        self.disk_hits = 0
+
+    def get(self, key, default=-1):
+        # Retrieve item from provided key, from memory or from disk. Return default (-1) if nonexistent.
+        value = self.lru.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if key in self.disk:
+            value = self.disk.pop(key)
+            self.disk_hits += 1
+            self.lru.set(key, value)
+            return value
+
+        return default
+
+    def set(self, key, value):
+        self.disk.discard(key)  # the spilled value is outdated
+        self.lru.set(key, value)
+
+    def close(self):
+        """Close and delete the spill file"""
+        self.disk.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    tmp_dir = tempfile.mkdtemp()
+
+    ### Test 1: evicted entries are spilled to disk, and promoted back on a hit
+    print("--- Test #1")
+    cache = Two_Tier_LRU_Cache(2, os.path.join(tmp_dir, "spill1"))
+
+    for i in range(5):
+        cache.set(i, f"value {i}")
+
+    print(sorted(cache.lru.cache), sorted(cache.disk.index))  # [3, 4] [0, 1, 2]
+    print(cache.get(0))  # value 0
+    print(sorted(cache.lru.cache), sorted(cache.disk.index))  # [0, 4] [1, 2, 3]
+    print(cache.get(9), cache.disk_hits)  # -1 1
+
+    ### Test 2: a set makes the spilled value outdated
+    print("--- Test #2")
+    cache.set(1, "newer")
+    print(cache.get(1), 1 in cache.disk)  # newer False
+    cache.close()
+
+    ### Test 3: the spill file compacts itself when it is mostly dead space
+    print("--- Test #3")
+    cache = Two_Tier_LRU_Cache(10, os.path.join(tmp_dir, "spill3"), compact_ratio=0.5, min_compact_size=1000)
+
+    for i in range(100):
+        cache.set(i, "x" * 100)
+    for i in range(80):
+        cache.get(i)  # promote, leaving dead records behind
+
+    print(cache.disk.dead_bytes <= 0.5 * cache.disk.size)  # True
+    print(all(cache.get(i) == "x" * 100 for i in range(100)))  # True
+    cache.close()
+
+    os.rmdir(tmp_dir)
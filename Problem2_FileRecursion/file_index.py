@@ -0,0 +1,157 @@
+import os
+import pickle
+import time
+
+
+class File_Index(object):
+    """A persistent index of a directory tree, answering find_files queries without walking the file system.
+
+    For each directory the index keeps its modification time (mtime), the names of its files and the names of its
+    sub-directories. Creating, deleting or renaming an entry changes the mtime of the directory that holds it, so
+    `refresh` re-lists only the directories whose mtime changed, and re-uses the cached entries of all the others
+    (it still has to `stat` every directory, which is much cheaper than listing it). The index is saved to and
+    loaded from a local file with pickle.
+
+    A directory modified less than `racy_window` seconds before it was listed may be modified again within the same
+    mtime tick, so its mtime is not trusted: it is re-listed on the next refresh."""
+
+    def __init__(self, root, index_path, racy_window=2.0):
+        self.root = root
+        self.index_path = index_path
+        self.racy_window = racy_window
+        self.dirs = dict()  # directory path -> (mtime_ns or None, file names, sub-directory names)
+
+        # statistics of the last refresh
+        self.listed = 0
+        self.reused = 0
+
+        if os.path.isfile(index_path):
+            self.load()
+
+    def load(self):
+        with open(self.index_path, "rb") as f:
+            root, dirs = pickle.load(f)
+        if root == self.root:  # an index of another tree is not used
+            self.dirs = dirs
+
+    def save(self):
+        """Write the index to a temporary file, then atomically replace the index file with it"""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((self.root, self.dirs), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self):
+        """Bring the index up to date, re-listing only the directories whose mtime changed"""
+        dirs = dict()  # directories that vanished are dropped with the old dictionary
+        self.listed = self.reused = 0
+
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:  # directory does not exist anymore
+                continue
+
+            cached = self.dirs.get(directory)
+            if cached is not None and cached[0] == mtime:
+                entry = cached
+                self.reused += 1
+            else:
+                entry = self._list(directory, mtime)
+                if entry is None:
+                    continue
+                self.listed += 1
+
+            dirs[directory] = entry
+            stack.extend(os.path.join(directory, name) for name in reversed(entry[2]))
+
+        self.dirs = dirs
+
+    def _list(self, directory, mtime):
+        files, sub_dirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError:  # not a directory, or cannot be read
+            return None
+
+        if time.time_ns() - mtime < self.racy_window * 1e9:  # too recent to be trusted
+            mtime = None
+        return mtime, files, sub_dirs
+
+    def find(self, suffix):
+        """
+        Find all files beneath the root with file name suffix, from the index (call `refresh` first to see the
+        latest changes).
+
+        Args:
+          suffix(str): suffix if the file name to be found
+
+        Returns:
+           a list of paths
+        """
+        return [os.path.join(directory, name)
+                for directory, (_, files, _) in self.dirs.items()
+                for name in files if name.endswith(suffix)]
+
+
+def find_files_indexed(suffix, path, index_path):
+    """find_files backed by a persistent File_Index: refreshes the index, saves it, and answers from it"""
+    index = File_Index(path, index_path)
+    index.refresh()
+    index.save()
+    return index.find(suffix)
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    from problem_2 import find_files
+
+    print("Please unzip the 'testdirs' archive with folders ")
+
+    # TEST #1: the index finds the same files as find_files
+    tmp_dir = tempfile.mkdtemp()
+    index_path = os.path.join(tmp_dir, "index.pickle")
+    indexed_files = find_files_indexed(".c", "testdirs/testdir", index_path)
+    print(sorted(indexed_files) == sorted(find_files(".c", "testdirs/testdir")))
+    # True
+
+    # TEST #2: a saved index is loaded, and unchanged directories are not listed again
+    tree = os.path.join(tmp_dir, "tree")
+    for sub_dir in ("a", "b", "b/c"):
+        os.makedirs(os.path.join(tree, sub_dir))
+        open(os.path.join(tree, sub_dir, "x.py"), "w").close()
+
+    index = File_Index(tree, index_path, racy_window=0)
+    index.refresh()
+    index.save()
+
+    time.sleep(0.05)
+    open(os.path.join(tree, "b", "c", "y.py"), "w").close()
+
+    index = File_Index(tree, index_path, racy_window=0)
+    index.refresh()
+    print(index.listed, index.reused)
+    # 1 3
+    print(sorted(os.path.relpath(p, tree) for p in index.find(".py")))
+    # ['a/x.py', 'b/c/x.py', 'b/c/y.py', 'b/x.py']
+
+    # TEST #3: a deleted directory is dropped from the index
+    shutil.rmtree(os.path.join(tree, "b"))
+    index.refresh()
+    print(sorted(os.path.relpath(p, tree) for p in index.find(".py")))
+    # ['a/x.py']
+
+    # TEST #4: non-existing directory
+    print(find_files_indexed(".py", "noSuchDirectory", os.path.join(tmp_dir, "index2.pickle")))
+    # []
+
+    shutil.rmtree(tmp_dir)
@@ -0,0 +1,137 @@
+import fnmatch
+import os
+import re
+
+_END = None  # trie key holding the suffix patterns that end at a node
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+class Pattern_Matcher(object):
+    """Matches a file name against many suffixes and glob patterns at once.
+
+    Suffixes are stored in a reversed-suffix trie (nested dictionaries keyed by characters, from the last character
+    of a suffix to the first one): walking a file name backwards from its last character visits every suffix it ends
+    with, in one pass that does not depend on the number of suffixes. Glob patterns (with *, ? or [...]) are compiled
+    to regular expressions with `fnmatch`."""
+
+    def __init__(self, patterns):
+        self.trie = dict()
+        self.globs = []  # (pattern, compiled regular expression)
+
+        for pattern in dict.fromkeys(patterns):  # a repeated pattern is stored once, and matched once
+            if _WILDCARDS.search(pattern):
+                self.globs.append((pattern, re.compile(fnmatch.translate(pattern))))
+                continue
+
+            node = self.trie
+            for char in reversed(pattern):
+                node = node.setdefault(char, dict())
+            node.setdefault(_END, []).append(pattern)
+
+    def match(self, name):
+        """Returns the list of patterns matching a file name"""
+        matched = list(self.trie.get(_END, ()))  # an empty suffix matches every name
+
+        node = self.trie
+        for char in reversed(name):
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                matched.extend(node[_END])
+
+        for pattern, regex in self.globs:
+            if regex.match(name):
+                matched.append(pattern)
+
+        return matched
+
+
+def find_files_multi(patterns, path, exclude_dirs=()):
+    """
+    Find all files beneath path matching any of many suffixes or glob patterns, in a single walk.
+
+    Every file name is matched against all the patterns at once with a Pattern_Matcher. Directories whose name is in
+    `exclude_dirs` (names like ".git", or glob patterns like "build*") are pruned: they are never descended into.
+
+    Args:
+      patterns(list of str): suffixes (".c") or glob patterns ("test_*.py") of the file names to be found
+      path(str): path of the file system
+      exclude_dirs(list of str): names or glob patterns of directories to skip
+
+    Returns:
+       a dictionary from each pattern to the list of paths matching it
+    """
+
+    patterns = list(dict.fromkeys(patterns))  # read once: patterns may be a generator
+    matcher = Pattern_Matcher(patterns)
+    results = {pattern: [] for pattern in patterns}
+
+    excluded_names = {name for name in exclude_dirs if not _WILDCARDS.search(name)}
+    excluded_globs = [name for name in exclude_dirs if _WILDCARDS.search(name)]
+
+    def is_excluded(name):
+        return name in excluded_names or any(fnmatch.fnmatchcase(name, glob) for glob in excluded_globs)
+
+    if os.path.isfile(path):  # provided path is a file
+        for pattern in matcher.match(os.path.basename(path)):
+            results[pattern].append(path)
+        return results
+
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                sub_dirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not is_excluded(entry.name):
+                            sub_dirs.append(entry.path)
+                        continue
+                    for pattern in matcher.match(entry.name):
+                        results[pattern].append(entry.path)
+        except OSError:  # path does not exist, or cannot be read
+            continue
+
+        stack.extend(reversed(sub_dirs))
+
+    return results
+
+
+if __name__ == "__main__":
+    from problem_2 import find_files
+
+    print("Please unzip the 'testdirs' archive with folders ")
+
+    # TEST #1: one walk gives the same files as one find_files walk per suffix
+    results = find_files_multi([".c", ".h"], "testdirs/testdir")
+    print(all(sorted(results[suffix]) == sorted(find_files(suffix, "testdirs/testdir")) for suffix in (".c", ".h")))
+    # True
+
+    # TEST #2: overlapping suffixes and glob patterns
+    matcher = Pattern_Matcher([".py", "o.py", "hello*.py", ".c"])
+    print(matcher.match("hello.py"))
+    # ['.py', 'o.py', 'hello*.py']
+    print(matcher.match("a.h"))
+    # []
+
+    # TEST #3: excluded directories are not descended into
+    results = find_files_multi([".py"], "testdirs/testdir3", exclude_dirs=["f4"])
+    print(results)
+    # {'.py': ['testdirs/testdir3/hello.py']}
+    results = find_files_multi([".py"], "testdirs/testdir3", exclude_dirs=["f*"])
+    print(results)
+    # {'.py': ['testdirs/testdir3/hello.py']}
+
+    # TEST #4: a repeated pattern reports each file once
+    results = find_files_multi([".py", ".py"], "testdirs/testdir3")
+    print(results == find_files_multi([".py"], "testdirs/testdir3"))
+    # True
+
+    # TEST #5: patterns given by a one-shot iterator
+    print(find_files_multi(iter([".py", ".c"]), "testdirs/testdir3", exclude_dirs=["f4"]))
+    # {'.py': ['testdirs/testdir3/hello.py'], '.c': []}
+
+    # TEST #6: non-existing directory
+    print(find_files_multi([".c", ".py"], "noSuchDirectory"))
+    # {'.c': [], '.py': []}
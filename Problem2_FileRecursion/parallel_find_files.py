@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from problem_2 import find_files_iter
+
+
+def _list_dir(suffix, path):
+    """List a single directory: returns the paths of files with the suffix, and the paths of sub-directories"""
+    matches, sub_dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    matches.append(entry.path)
+    except OSError:  # path does not exist, or cannot be read
+        pass
+    return matches, sub_dirs
+
+
+def find_files_parallel(suffix, path, workers=8, ordered=True, max_pending=None):
+    """
+    Find all files beneath path with file name suffix, listing directories in parallel with a thread pool.
+
+    Listing a directory is I/O-bound (and `os.scandir` releases the GIL), so on large or network file systems
+    several directories can be listed at once. At most `max_pending` directory listings are submitted to the pool
+    and not yet consumed at any time, the other discovered directories wait in a plain list of paths.
+
+    With `ordered=True` the paths come in the same, stable order as from `find_files_iter`, no matter how the
+    listings are scheduled: directories are listed ahead in parallel, but their files are yielded in depth-first
+    order. With `ordered=False` the files of each directory are yielded as soon as its listing is done.
+
+    Args:
+      suffix(str): suffix if the file name to be found
+      path(str): path of the file system
+      workers(int): number of threads listing directories
+      ordered(bool): yield the paths in a stable order, or as soon as they are found
+      max_pending(int): max number of directory listings in progress or waiting to be consumed,
+        default 4 * workers
+
+    Returns:
+       a generator of paths
+    """
+
+    if os.path.isfile(path):  # provided path is a file
+        yield from find_files_iter(suffix, path)
+        return
+
+    max_pending = max_pending or 4 * workers
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        if ordered:
+            yield from _walk_ordered(executor, suffix, path, max_pending)
+        else:
+            yield from _walk_unordered(executor, suffix, path, max_pending)
+    finally:  # also when the consumer stops early: do not list the rest of the tree
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _walk_ordered(executor, suffix, path, max_pending):
+    stack = [path]  # directories in the order their files are yielded, the next one on top
+    futures = dict()  # directory -> listing submitted to the pool, and not yet consumed
+
+    while stack:
+        # list ahead the directories that will be needed next
+        for directory in reversed(stack):
+            if len(futures) >= max_pending:
+                break
+            if directory not in futures:
+                futures[directory] = executor.submit(_list_dir, suffix, directory)
+
+        directory = stack.pop()
+        if directory not in futures:
+            futures[directory] = executor.submit(_list_dir, suffix, directory)
+        matches, sub_dirs = futures.pop(directory).result()
+
+        yield from matches
+        stack.extend(reversed(sub_dirs))
+
+
+def _walk_unordered(executor, suffix, path, max_pending):
+    to_list = [path]  # discovered directories, not yet submitted to the pool
+    running = set()
+
+    while to_list or running:
+        while to_list and len(running) < max_pending:
+            running.add(executor.submit(_list_dir, suffix, to_list.pop()))
+
+        done, running = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            matches, sub_dirs = future.result()
+            yield from matches
+            to_list.extend(sub_dirs)
+
+
+if __name__ == "__main__":
+    print("Please unzip the 'testdirs' archive with folders ")
+
+    # TEST #1: the ordered parallel walk returns the files in the same order as the sequential one
+    parallel_files = list(find_files_parallel(".c", "testdirs/testdir", workers=4))
+    print(parallel_files == list(find_files_iter(".c", "testdirs/testdir")))
+    # True
+
+    # TEST #2: the unordered parallel walk returns the same files
+    print(sorted(find_files_parallel(".py", "testdirs/testdir3", ordered=False)))
+    # ['testdirs/testdir3/f4/hello.py', 'testdirs/testdir3/f4/hello2.py', 'testdirs/testdir3/f4/hello3.py',
+    #  'testdirs/testdir3/hello.py']
+
+    # TEST #3: empty and non-existing directories
+    print(list(find_files_parallel(".py", "testdirs/testdir2")))
+    # []
+    print(list(find_files_parallel(".py", "noSuchDirectory", ordered=False)))
+    # []
+
+    # TEST #4: the consumer can stop early
+    print(next(find_files_parallel(".h", "testdirs/testdir", workers=2, max_pending=1)).endswith(".h"))
+    # True
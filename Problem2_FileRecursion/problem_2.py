@@ -37,6 +37,45 @@ def find_files(suffix, path):
     return return_list
 
 
+def find_files_iter(suffix, path):
+    """
+    Find all files beneath path with file name suffix, yielding them one by one as they are found.
+
+    The directory tree is walked iteratively with an explicit stack of directories (so there is no recursion
+    limit), and each directory is listed once with `os.scandir`, whose entries already know if they are
+    directories. Symbolic links to directories are not followed. Directories that disappear or cannot be read
+    during the walk are skipped.
+
+    Args:
+      suffix(str): suffix if the file name to be found
+      path(str): path of the file system
+
+    Returns:
+       a generator of paths
+    """
+
+    if os.path.isfile(path):  # provided path is a file
+        if path.endswith(suffix):
+            yield path
+        return
+
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                sub_dirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    elif entry.name.endswith(suffix):
+                        yield entry.path
+        except OSError:  # path does not exist, or cannot be read
+            continue
+
+        # reversed, so that sub-directories are walked in the order they were listed
+        stack.extend(reversed(sub_dirs))
+
+
 if __name__ == "__main__":
     print("Please unzip the 'testdirs' archive with folders ")
 
@@ -55,3 +94,13 @@ if __name__ == "__main__":
     # TEST #4: custom test dir with .py files
     print(find_files(".py", "testdirs/testdir3"))
     # ['testdir3/hello.py', 'testdir3/f4/hello.py', 'testdir3/f4/hello3.py', 'testdir3/f4/hello2.py']
+
+    # TEST #5: the generator variant finds the same files
+    print(sorted(find_files_iter(".c", "testdirs/testdir")) == sorted(find_files(".c", "testdirs/testdir")))
+    # True
+
+    # TEST #6: the generator variant on a non-existing directory, and on a single file
+    print(list(find_files_iter(".py", "noSuchDirectory")))
+    # []
+    print(list(find_files_iter(".c", "testdirs/testdir/t1.c")))
+    # ['testdirs/testdir/t1.c']
@@ -0,0 +1,46 @@
+"""Benchmark: frequency counting and encoding of bytes, per character (Counter and pack_bits) vs the bulk paths of
+bytes_huffman.py (pure Python, and numpy when it is installed).
+
+Usage: python bench_bytes_huffman.py [n_bytes]    (default 100 MB of english-like text)
+"""
+import sys
+import time
+from collections import Counter
+
+import bytes_huffman
+from bench_canonical_huffman import english_like
+from bytes_huffman import count_bytes, encode_bytes
+from canonical_huffman import canonical_codes, huffman_code_lengths
+from problem_3 import pack_bits
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_bytes = int(sys.argv[1]) if len(sys.argv) > 1 else int(100e6)
+    data = english_like(n_bytes).encode()
+    mb = n_bytes / 1e6
+
+    counts, _ = timed(Counter, data)
+    codes = canonical_codes(huffman_code_lengths(counts))
+
+    paths = {"per character (Counter, pack_bits)": (Counter, lambda: pack_bits(data, codes))}
+    paths["bulk, pure Python"] = (lambda d: count_bytes(d, False), lambda: encode_bytes(data, codes, False))
+    if bytes_huffman.np is not None:
+        paths["bulk, numpy"] = (lambda d: count_bytes(d, True), lambda: encode_bytes(data, codes, True))
+    else:
+        print("numpy is not installed, skipping the numpy path")
+
+    print(f"{n_bytes} bytes")
+    print(f"{'path':>36} {'count MB/s':>11} {'encode MB/s':>12} {'total':>8}")
+    expected = None
+    for name, (count, encode) in paths.items():
+        _, count_time = timed(count, data)
+        encoded, encode_time = timed(encode)
+        expected = expected or encoded
+        assert encoded == expected
+        print(f"{name:>36} {mb / count_time:>11.1f} {mb / encode_time:>12.1f} {count_time + encode_time:>7.2f}s")
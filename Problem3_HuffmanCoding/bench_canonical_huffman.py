@@ -0,0 +1,55 @@
+"""Benchmark: encode and decode MB/s of the Huffman tree walker vs canonical codes with the table-driven decoder.
+
+Usage: python bench_canonical_huffman.py [n_characters]
+"""
+import random
+import string
+import sys
+import time
+
+from canonical_huffman import canonical_decoding, canonical_encoding
+from problem_3 import huffman_decoding, huffman_decoding_packed, huffman_encoding, huffman_encoding_packed
+
+CODERS = {
+    "tree, '0'/'1' string": (huffman_encoding, huffman_decoding),
+    "tree, packed bytes": (huffman_encoding_packed, huffman_decoding_packed),
+    "canonical, table decoder": (canonical_encoding, canonical_decoding),
+}
+
+
+def english_like(n, seed=0):
+    """Random text with the letter frequencies of English (skewed, unlike uniform random letters)"""
+    letters = " etaoinshrdlcumwfgypbvkjxqz"
+    weights = [18, 12.7, 9.1, 8.2, 7.5, 7.0, 6.7, 6.3, 6.1, 6.0, 4.3, 4.0, 2.8, 2.8, 2.4, 2.4, 2.2, 2.0, 2.0, 1.9,
+               1.5, 1.0, 0.8, 0.2, 0.2, 0.1, 0.1]
+    return "".join(random.Random(seed).choices(letters, weights, k=n))
+
+
+def measure(encode, decode, data):
+    start = time.perf_counter()
+    encoded = encode(data)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = decode(*encoded)
+    decode_time = time.perf_counter() - start
+
+    assert decoded == data
+    mb = len(data) / 1e6
+    return mb / encode_time, mb / decode_time
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else int(1e6)
+    rnd = random.Random(0)
+    inputs = {
+        "uniform A-Z": "".join(rnd.choice(string.ascii_uppercase) for _ in range(n)),
+        "english-like": english_like(n),
+    }
+
+    print(f"{n} characters, MB/s of input data")
+    print(f"{'coder':>26} {'input':>14} {'encode MB/s':>12} {'decode MB/s':>12}")
+    for coder, (encode, decode) in CODERS.items():
+        for name, data in inputs.items():
+            encode_speed, decode_speed = measure(encode, decode, data)
+            print(f"{coder:>26} {name:>14} {encode_speed:>12.2f} {decode_speed:>12.2f}")
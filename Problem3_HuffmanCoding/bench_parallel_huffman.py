@@ -0,0 +1,48 @@
+"""Benchmark: scaling of parallel block compression and decompression over 1, 2, 4 and 8 worker processes.
+
+Compresses english-like random text (see bench_canonical_huffman.py) in memory, and checks that every worker count
+gives the same bytes. The speedup is bounded by the number of CPU cores, and by the sequential work of the main
+process (reading, writing, and sending the blocks to the workers).
+
+Usage: python bench_parallel_huffman.py [n_bytes] [block_size]
+"""
+import io
+import os
+import sys
+import time
+
+from bench_canonical_huffman import english_like
+from huffman_stream import compress_stream, decompress_stream
+from parallel_huffman import compress_stream_parallel, decompress_stream_parallel
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_bytes = int(sys.argv[1]) if len(sys.argv) > 1 else int(8e6)
+    block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1 << 20
+    data = english_like(n_bytes).encode()
+
+    print(f"{n_bytes} bytes, blocks of {block_size} bytes, {os.cpu_count()} CPUs")
+    compressed = io.BytesIO()
+    compress_time = timed(compress_stream, io.BytesIO(data), compressed, block_size)
+    decompress_time = timed(decompress_stream, io.BytesIO(compressed.getvalue()), io.BytesIO())
+    print(f"{'sequential':>12}: compress {compress_time:.2f}s, decompress {decompress_time:.2f}s")
+
+    for workers in (1, 2, 4, 8):
+        output = io.BytesIO()
+        parallel_compress_time = timed(compress_stream_parallel, io.BytesIO(data), output, block_size, workers)
+        assert output.getvalue() == compressed.getvalue()
+
+        decompressed = io.BytesIO()
+        parallel_decompress_time = timed(decompress_stream_parallel, io.BytesIO(output.getvalue()), decompressed,
+                                         workers)
+        assert decompressed.getvalue() == data
+
+        print(f"{workers:>4} workers: compress {parallel_compress_time:.2f}s "
+              f"(x{compress_time / parallel_compress_time:.2f}), "
+              f"decompress {parallel_decompress_time:.2f}s (x{decompress_time / parallel_decompress_time:.2f})")
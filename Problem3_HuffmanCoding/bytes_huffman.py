@@ -0,0 +1,163 @@
+import sys
+
+from canonical_huffman import BYTE_SYMBOLS, canonical_codes, huffman_code_lengths
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure-Python paths are used without it
+    np = None
+
+CHUNK_SIZE = 1 << 20  # input bytes encoded at a time (even, so that chunks split into 16-bit pairs)
+PAIR_TABLE_MIN_SIZE = 1 << 16  # smaller inputs are encoded a byte at a time, building the pair table costs more
+
+
+def count_bytes(data, use_numpy=None):
+    """Count the occurrences of every byte value in bytes, returns a list of 256 counts.
+
+    With numpy this is a single `bincount`. Without it, `set` finds the byte values present in one C-level pass,
+    then `bytes.count` counts each of them (also in C): there is no Python-level work per input byte, unlike
+    the dictionary loop of `huffman_encoding`."""
+
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).tolist()
+
+    data = bytes(data)
+    counts = [0] * 256
+    for byte in set(data):
+        counts[byte] = data.count(byte)
+    return counts
+
+
+def _pair_table(single):
+    """Given the '0'/'1' strings of the codes of the 256 byte values, the strings of all 65536 pairs of bytes,
+    indexed like `memoryview.cast('H')` reads them (in the native byte order)"""
+    if sys.byteorder == "little":
+        return [single[pair & 0xff] + single[pair >> 8] for pair in range(1 << 16)]
+    return [single[pair >> 8] + single[pair & 0xff] for pair in range(1 << 16)]
+
+
+def _encode_chunks_python(data, codes):
+    """Yields the '0'/'1' string of each chunk: the per-symbol codes are looked up two bytes at a time, and joined
+    by `str.join` over a `map`, so the loop over the input runs in C"""
+    single = [format(codes[byte][0], f"0{codes[byte][1]}b") if byte in codes else "" for byte in range(256)]
+    if len(data) < PAIR_TABLE_MIN_SIZE:
+        yield "".join(map(single.__getitem__, data))
+        return
+
+    pairs = _pair_table(single)
+    for start in range(0, len(data), CHUNK_SIZE):
+        chunk = memoryview(data)[start:start + CHUNK_SIZE]
+        bits = "".join(map(pairs.__getitem__, chunk[:len(chunk) // 2 * 2].cast("H")))
+        if len(chunk) % 2:
+            bits += single[chunk[-1]]
+        yield bits
+
+
+def _encode_python(data, codes):
+    out = []
+    carry = ""  # bits left over from the previous chunk, fewer than 8
+    for bits in _encode_chunks_python(data, codes):
+        bits = carry + bits
+        n_bytes = len(bits) // 8
+        if n_bytes:  # parsing a base-2 string into an int is linear in CPython
+            out.append(int(bits[:n_bytes * 8], 2).to_bytes(n_bytes, "big"))
+        carry = bits[n_bytes * 8:]
+
+    padding = -len(carry) % 8
+    if carry:
+        out.append(int(carry + "0" * padding, 2).to_bytes(1, "big"))
+    return b"".join(out), padding
+
+
+def _encode_numpy(data, codes):
+    code_table = np.zeros(256, dtype=np.uint64)
+    length_table = np.zeros(256, dtype=np.uint64)
+    for byte, (code, length) in codes.items():
+        code_table[byte], length_table[byte] = code, length
+
+    out = []
+    carry, carry_length = 0, 0  # bits left over from the previous chunk, fewer than 8
+    for start in range(0, len(data), CHUNK_SIZE):
+        symbols = np.frombuffer(data, dtype=np.uint8, count=min(CHUNK_SIZE, len(data) - start), offset=start)
+        codes_of = code_table[symbols]
+        lengths_of = length_table[symbols]
+        ends = np.cumsum(lengths_of) + np.uint64(carry_length)
+        starts = ends - lengths_of
+        n_bits = int(ends[-1])
+
+        # Every code is shifted to its bit position within the 64 bits of the two 32-bit words it falls into, and
+        # the halves are summed into the words with `bincount`. The codes do not overlap, so the sums are bitwise
+        # ORs, and the halves are below 2^32, so they are exact in the float64 weights of `bincount`.
+        words = starts >> np.uint64(5)
+        aligned = codes_of << (np.uint64(64) - lengths_of - (starts & np.uint64(31)))
+        n_words = (n_bits + 31) // 32 + 1
+        buffer = np.bincount(words, (aligned >> np.uint64(32)).astype(np.float64), n_words)
+        buffer += np.bincount(words + np.uint64(1), (aligned & np.uint64(0xffffffff)).astype(np.float64), n_words)
+        buffer[0] += carry << (32 - carry_length)
+        buffer = buffer.astype(np.uint32).astype(">u4").tobytes()
+
+        out.append(buffer[:n_bits // 8])
+        carry_length = n_bits % 8
+        carry = buffer[n_bits // 8] >> (8 - carry_length)
+
+    padding = -carry_length % 8
+    if carry_length:
+        out.append(bytes([carry << padding]))
+    return b"".join(out), padding
+
+
+def encode_bytes(data, codes, use_numpy=None):
+    """Encode bytes with the given codes (dict of byte value -> (code, length)) in bulk, returns a tuple of the
+    packed bytes and the number of padding bits, exactly like `pack_bits`.
+
+    With numpy, the codes and lengths of a whole chunk are gathered with table lookups, and the bits are placed
+    with a few vectorized passes that OR them into 32-bit words (see `_encode_numpy`). Without it, a table of the
+    code strings of all 65536 pairs of bytes is mapped over the input read as 16-bit values (`memoryview.cast('H')`)."""
+
+    if len(data) == 0:
+        return b"", 0
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and max(length for _, length in codes.values()) > 32:  # too long for the 32-bit words of numpy
+        use_numpy = False
+    return _encode_numpy(data, codes) if use_numpy else _encode_python(data, codes)
+
+
+def bytes_encoding(data, use_numpy=None):
+    """Canonical Huffman encoding of bytes with the bulk paths above. Outputs the same tuple as
+    `canonical_encoding` (encoded bytes, padding bits, code lengths, kind), to be decoded with `canonical_decoding`"""
+
+    if len(data) == 0:
+        return b"", 0, {}, BYTE_SYMBOLS
+
+    counts = count_bytes(data, use_numpy)
+    lengths = huffman_code_lengths({byte: count for byte, count in enumerate(counts) if count})
+    packed, padding = encode_bytes(data, canonical_codes(lengths), use_numpy)
+    return packed, padding, lengths, BYTE_SYMBOLS
+
+
+if __name__ == "__main__":
+    import random
+    from collections import Counter
+
+    from canonical_huffman import canonical_decoding, canonical_encoding
+
+    modes = [False, True] if np is not None else [False]
+
+    # TEST #1: counts match a Counter
+    print("Test #1")
+    data = bytes(random.choice(b"abcdefgh\x00\xff") for _ in range(100000))
+    counts = Counter(data)
+    print(all(count_bytes(data, mode) == [counts[byte] for byte in range(256)] for mode in modes))  # True
+
+    # TEST #2: the same output as canonical_encoding, for even and odd lengths, and more than one chunk
+    print("Test #2")
+    for data in [b"The bird is the word", b"A", b"AB" * 10, bytes(range(256)) * 5000 + b"xyz"]:
+        print(all(bytes_encoding(data, mode) == canonical_encoding(data) for mode in modes))  # True
+
+    # TEST #3: round trip, and empty input
+    print("Test #3")
+    print(canonical_decoding(*bytes_encoding(data)) == data)  # True
+    print(bytes_encoding(b""), canonical_decoding(*bytes_encoding(b"")))  # (b'', 0, {}, 0) b''
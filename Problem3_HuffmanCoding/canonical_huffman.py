@@ -0,0 +1,303 @@
+import heapq
+from collections import Counter
+
+from problem_3 import pack_bits
+
+BYTE_SYMBOLS, STR_SYMBOLS = 0, 1  # kind of the symbols of a serialized codebook
+
+
+def huffman_code_lengths(frequencies):
+    """Given a frequency table (dict), computes the length of the Huffman code of every symbol (dict).
+
+    Instead of building a tree of nodes, the heap holds groups of symbols: merging two groups makes the codes of all
+    their symbols one bit longer. Ties are broken by the order of the sorted symbols, so equal inputs always give
+    equal lengths. A single symbol gets a code of 1 bit."""
+
+    if len(frequencies) == 1:
+        return {symbol: 1 for symbol in frequencies}
+
+    lengths = {symbol: 0 for symbol in frequencies}
+    heap = [(freq, order, [symbol]) for order, (symbol, freq) in enumerate(sorted(frequencies.items()))]
+    heapq.heapify(heap)
+    order = len(heap)
+
+    while len(heap) > 1:
+        freq1, _, symbols1 = heapq.heappop(heap)
+        freq2, _, symbols2 = heapq.heappop(heap)
+        for symbol in symbols1:
+            lengths[symbol] += 1
+        for symbol in symbols2:
+            lengths[symbol] += 1
+        symbols1.extend(symbols2)
+        heapq.heappush(heap, (freq1 + freq2, order, symbols1))
+        order += 1
+
+    return lengths
+
+
+def canonical_codes(lengths):
+    """Given code lengths (dict), assigns canonical Huffman codes: symbols sorted by (length, symbol) get consecutive
+    codes, and the code is shifted left whenever the length grows. The codes are determined by the lengths alone,
+    so only the lengths need to be known to decode. Returns a dict of symbol -> (code, length)."""
+
+    codes = {}
+    code, prev_length = 0, 0
+
+    for length, symbol in sorted((length, symbol) for symbol, length in lengths.items()):
+        code <<= length - prev_length
+        codes[symbol] = (code, length)
+        code += 1
+        prev_length = length
+
+    return codes
+
+
+class Canonical_Decoder(object):
+    """A table-driven decoder of canonical Huffman codes, resolving a whole byte (8 bits) per step.
+
+    The codes are arranged in a binary decoding trie whose internal nodes are the decoder states. For a state and
+    an input byte, the table holds the symbols completed by walking the 8 bits from that state, and the state
+    reached after them. Each table entry is computed the first time it is needed, so only the (state, byte)
+    pairs that actually occur in the data are ever walked bit by bit."""
+
+    def __init__(self, lengths):
+        self.symbols = []
+        self.children = [[None, None]]  # internal node -> [left, right], a leaf is stored as ~symbol index
+        self.as_bytes = all(type(symbol) == int for symbol in lengths)  # symbols are byte values
+        self.empty = b"" if self.as_bytes else ""
+
+        for symbol, (code, length) in canonical_codes(lengths).items():
+            node = 0
+            for shift in range(length - 1, 0, -1):
+                bit = (code >> shift) & 1
+                if self.children[node][bit] is None:
+                    self.children[node][bit] = len(self.children)
+                    self.children.append([None, None])
+                node = self.children[node][bit]
+            self.children[node][code & 1] = ~len(self.symbols)
+            self.symbols.append(symbol)
+
+        self.table = [None] * (len(self.children) << 8)  # (state << 8 | byte) -> (fragment, next state)
+
+    def _fragment(self, symbols):
+        return bytes(symbols) if self.as_bytes else "".join(symbols)
+
+    def _walk(self, state, bits, n_bits):
+        """Walk n_bits bits (most significant first) from a state, returns (decoded fragment, next state)"""
+        decoded = []
+        for shift in range(n_bits - 1, -1, -1):
+            child = self.children[state][(bits >> shift) & 1]
+            if child is None:
+                raise ValueError("Invalid Huffman code in the data")
+            if child < 0:  # a leaf
+                decoded.append(self.symbols[~child])
+                state = 0
+            else:
+                state = child
+        return self._fragment(decoded), state
+
+    def decode(self, data, padding):
+        """Decode packed bytes, ignoring the padding bits of the last byte"""
+        if len(data) == 0:
+            return self.empty
+
+        table = self.table
+        fragments = []
+        state = 0
+
+        for byte in memoryview(data)[:-1]:
+            entry = table[state << 8 | byte]
+            if entry is None:
+                entry = table[state << 8 | byte] = self._walk(state, byte, 8)
+            fragment, state = entry
+            fragments.append(fragment)
+
+        fragment, state = self._walk(state, data[-1] >> padding, 8 - padding)
+        fragments.append(fragment)
+
+        if state != 0:
+            raise ValueError("Huffman data ends in the middle of a code")
+
+        return self.empty.join(fragments)
+
+
+def _write_varint(out, n):
+    """Append a non-negative integer to a bytearray, 7 bits per byte, the high bit set on all but the last byte"""
+    while n >= 0x80:
+        out.append(n & 0x7f | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, offset):
+    """Read a varint from bytes at offset, returns (integer, offset after it)"""
+    n, shift = 0, 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated Huffman codebook")
+        byte = data[offset]
+        offset += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, offset
+        shift += 7
+
+
+def serialize_lengths(lengths, kind=None):
+    """Serialize code lengths (dict of byte values or of characters) into a compact codebook (bytes).
+
+    Canonical codes only depend on the (symbol, length) pairs sorted by (length, symbol), so the codebook stores the
+    number of symbols of each code length, then the symbols in that order: one byte per symbol for byte values, or
+    UTF-8 for characters. The lengths are implied by the counts, so a codebook of 26 letters takes ~33 bytes. The
+    kind of the symbols (BYTE_SYMBOLS or STR_SYMBOLS) is guessed from the symbols when not given."""
+
+    if kind is None:
+        kind = BYTE_SYMBOLS if all(type(symbol) == int for symbol in lengths) else STR_SYMBOLS
+    as_bytes = kind == BYTE_SYMBOLS
+    order = sorted((length, symbol) for symbol, length in lengths.items())
+    max_length = order[-1][0] if order else 0
+
+    counts = [0] * max_length
+    for length, _ in order:
+        counts[length - 1] += 1
+
+    out = bytearray([BYTE_SYMBOLS if as_bytes else STR_SYMBOLS])
+    _write_varint(out, max_length)
+    for count in counts:
+        _write_varint(out, count)
+
+    symbols = [symbol for _, symbol in order]
+    out += bytes(symbols) if as_bytes else "".join(symbols).encode("utf-8", "surrogatepass")
+    return bytes(out)
+
+
+def deserialize_lengths(data):
+    """Read a codebook written by `serialize_lengths` (the whole of data), returns the code lengths (dict)"""
+    if len(data) == 0 or data[0] not in (BYTE_SYMBOLS, STR_SYMBOLS):
+        raise ValueError("Invalid Huffman codebook")
+
+    max_length, offset = _read_varint(data, 1)
+    counts = []
+    for _ in range(max_length):
+        count, offset = _read_varint(data, offset)
+        counts.append(count)
+
+    if data[0] == BYTE_SYMBOLS:
+        symbols = list(data[offset:])
+    else:
+        symbols = list(bytes(data[offset:]).decode("utf-8", "surrogatepass"))
+    if len(symbols) != sum(counts):
+        raise ValueError("Invalid Huffman codebook")
+
+    lengths = {}
+    symbols = iter(symbols)
+    for length, count in enumerate(counts, 1):
+        for _ in range(count):
+            lengths[next(symbols)] = length
+    return lengths
+
+
+def _kind(data):
+    """The kind of the symbols of data: BYTE_SYMBOLS for bytes, STR_SYMBOLS for a string"""
+    return BYTE_SYMBOLS if isinstance(data, (bytes, bytearray, memoryview)) else STR_SYMBOLS
+
+
+def _empty(kind):
+    return b"" if kind == BYTE_SYMBOLS else ""
+
+
+def canonical_encoding(data):
+    """Canonical Huffman encoding: given a string (or bytes), outputs a tuple of the encoded bytes, the number of
+    padding bits in the last byte, the code lengths (dict) needed to decode the data, and the kind of the data
+    (STR_SYMBOLS or BYTE_SYMBOLS), which tells the decoder what to return for an empty input"""
+
+    if data is None or len(data) == 0:
+        return b"", 0, {}, _kind(data)
+
+    lengths = huffman_code_lengths(Counter(data))
+    packed, padding = pack_bits(data, canonical_codes(lengths))
+    return packed, padding, lengths, _kind(data)
+
+
+def canonical_decoding(data, padding, lengths, kind=STR_SYMBOLS):
+    """Given bytes encoded by `canonical_encoding`, the number of padding bits, the code lengths and the kind of the
+    data, outputs the decoded string (or bytes, if bytes were encoded)"""
+
+    if not lengths:
+        return _empty(kind)
+    return Canonical_Decoder(lengths).decode(data, padding)
+
+
+def canonical_encoding_serialized(data):
+    """Canonical Huffman encoding into a single self-contained message (bytes), which can be stored or sent to
+    another process: the number of symbols and the padding bits, the codebook and the encoded bytes"""
+
+    packed, padding, lengths, kind = canonical_encoding(data)
+    codebook = serialize_lengths(lengths, kind)
+
+    out = bytearray()
+    _write_varint(out, len(data) if data else 0)
+    out.append(padding)
+    _write_varint(out, len(codebook))
+    return bytes(out) + codebook + packed
+
+
+def canonical_decoding_serialized(message):
+    """Decode a message written by `canonical_encoding_serialized`"""
+    n_symbols, offset = _read_varint(message, 0)
+    if offset >= len(message):
+        raise ValueError("Truncated Huffman message")
+    padding = message[offset]
+    codebook_size, offset = _read_varint(message, offset + 1)
+    codebook = message[offset:offset + codebook_size]
+    lengths = deserialize_lengths(codebook)
+
+    if not lengths:
+        return _empty(codebook[0])
+    decoded = Canonical_Decoder(lengths).decode(message[offset + codebook_size:], padding)
+    if len(decoded) != n_symbols:
+        raise ValueError("Corrupted Huffman message")
+    return decoded
+
+
+if __name__ == "__main__":
+    import random
+    import string
+
+    # TEST #0: canonical codes of a known frequency table
+    print("Test #0")
+    lengths = huffman_code_lengths({"A": 5, "B": 2, "C": 1, "D": 1})
+    print(lengths)  # {'A': 1, 'B': 2, 'C': 3, 'D': 3}
+    print({symbol: format(code, f"0{length}b") for symbol, (code, length) in canonical_codes(lengths).items()})
+    # {'A': '0', 'B': '10', 'C': '110', 'D': '111'}
+
+    # TEST #1: provided sentence
+    print("Test #1")
+    a_great_sentence = "The bird is the word"
+    encoded_data, padding, lengths, kind = canonical_encoding(a_great_sentence)
+    print(len(encoded_data), canonical_decoding(encoded_data, padding, lengths) == a_great_sentence)  # 9 True
+
+    # TEST #2: edge cases: empty string, a single repetitive character
+    print("Test #2")
+    for data in ["", "A", "A"*10, b"", b"A"]:
+        print(repr(canonical_decoding(*canonical_encoding(data))) == repr(data))  # True
+
+    # TEST #3: bytes in, bytes out
+    print("Test #3")
+    data = bytes(random.choice(b"abcdefgh") for _ in range(1000))
+    print(canonical_decoding(*canonical_encoding(data)) == data)  # True
+
+    # TEST #4: a big random string
+    print("Test #4")
+    data = ''.join(random.choice(string.ascii_uppercase) for _ in range(int(1e6)))
+    print(canonical_decoding(*canonical_encoding(data)) == data)  # True
+
+    # TEST #5: serialized codebooks and messages
+    print("Test #5")
+    lengths = huffman_code_lengths(Counter(string.ascii_uppercase * 3 + "AAAB"))
+    codebook = serialize_lengths(lengths)
+    print(len(codebook), deserialize_lengths(codebook) == lengths)  # 33 True
+    for data in [a_great_sentence, "", b"", "A", "zażółć gęślą jaźń", b"\x00\xff" * 100]:
+        message = canonical_encoding_serialized(data)
+        print(repr(canonical_decoding_serialized(message)) == repr(data))  # True
+    print(len(canonical_encoding_serialized(a_great_sentence)))  # 30
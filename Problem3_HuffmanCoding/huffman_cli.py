@@ -0,0 +1,88 @@
+"""Command-line Huffman compression of files, in the block container format of huffman_stream.py.
+
+Usage:
+  python huffman_cli.py compress input_file output_file [--block-size BYTES] [--workers N]
+  python huffman_cli.py decompress input_file output_file [--workers N]
+
+A file name of '-' reads from the standard input, or writes to the standard output. The sizes, the compression
+ratio and the throughput are reported on the standard error.
+"""
+import argparse
+import os
+import sys
+import time
+
+from huffman_stream import DEFAULT_BLOCK_SIZE, compress_stream, decompress_stream
+from parallel_huffman import compress_stream_parallel, decompress_stream_parallel
+
+
+def _open(path, mode):
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        return open(stream.fileno(), mode, closefd=False)
+    return open(path, mode)
+
+
+def compress(args):
+    with _open(args.input, "rb") as src, _open(args.output, "wb") as dst:
+        if args.workers > 1:
+            return compress_stream_parallel(src, dst, args.block_size, args.workers)
+        return compress_stream(src, dst, args.block_size)
+
+
+def decompress(args):
+    with _open(args.input, "rb") as src, _open(args.output, "wb") as dst:
+        if args.workers > 1:
+            bytes_out = decompress_stream_parallel(src, dst, args.workers)
+        else:
+            bytes_out = decompress_stream(src, dst)
+
+    # the decoder stops at the end marker, so the compressed size is taken from the file (unknown for a pipe)
+    bytes_in = None if args.input == "-" else os.path.getsize(args.input)
+    return bytes_in, bytes_out
+
+
+def report(command, bytes_in, bytes_out, elapsed):
+    """Print the sizes, the ratio of the compressed to the original size and the throughput (of original data)"""
+    original, compressed = (bytes_in, bytes_out) if command == "compress" else (bytes_out, bytes_in)
+    throughput = original / 1e6 / elapsed if elapsed else 0
+    if compressed is None:
+        print(f"{command}: {original} bytes, {throughput:.2f} MB/s in {elapsed:.2f}s", file=sys.stderr)
+        return
+
+    ratio = compressed / original if original else 0
+    print(f"{command}: {bytes_in} -> {bytes_out} bytes, ratio {ratio:.1%}, {throughput:.2f} MB/s in {elapsed:.2f}s",
+          file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Huffman compression of files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compress_parser = commands.add_parser("compress", help="compress a file")
+    compress_parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                                 help=f"bytes per block, default {DEFAULT_BLOCK_SIZE}")
+    decompress_parser = commands.add_parser("decompress", help="decompress a file")
+
+    for command_parser in (compress_parser, decompress_parser):
+        command_parser.add_argument("input", help="input file, '-' for the standard input")
+        command_parser.add_argument("output", help="output file, '-' for the standard output")
+        command_parser.add_argument("--workers", type=int, default=1, help="number of worker processes, default 1")
+
+    args = parser.parse_args(argv)
+    if args.command == "compress" and args.block_size <= 0:
+        parser.error("--block-size must be a positive integer")
+
+    start = time.perf_counter()
+    try:
+        bytes_in, bytes_out = compress(args) if args.command == "compress" else decompress(args)
+    except (OSError, ValueError) as e:
+        print(f"{args.command}: {e}", file=sys.stderr)
+        return 1
+
+    report(args.command, bytes_in, bytes_out, time.perf_counter() - start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import bisect
+import struct
+
+from bytes_huffman import bytes_encoding
+from canonical_huffman import Canonical_Decoder, deserialize_lengths, serialize_lengths
+
+# Container format (all integers big-endian):
+#   file header:  MAGIC, block size (uint32)
+#   block:        BLOCK_HEADER (n_symbols uint32, payload length uint32, padding uint8, codebook length uint16),
+#                 codebook (see `serialize_lengths`), payload
+#   end marker:   a BLOCK_HEADER of zeros
+#   block index:  number of blocks (uint32), then (offset uint64, n_symbols uint32) of every block
+#   trailer:      offset of the block index (uint64), INDEX_MAGIC
+MAGIC = b"HUFS"
+INDEX_MAGIC = b"HUFX"
+FILE_HEADER = struct.Struct(">4sI")
+BLOCK_HEADER = struct.Struct(">IIBH")
+INDEX_ENTRY = struct.Struct(">QI")
+TRAILER = struct.Struct(">Q4s")
+DEFAULT_BLOCK_SIZE = 1 << 20  # 1 MiB
+
+
+def encode_block(block):
+    """Huffman-encode one block of bytes with its own canonical codebook, returns the framed block (bytes)"""
+    payload, padding, lengths, _ = bytes_encoding(block)
+    codebook = serialize_lengths(lengths)
+    return BLOCK_HEADER.pack(len(block), len(payload), padding, len(codebook)) + codebook + payload
+
+
+def _read_exactly(src, size):
+    data = src.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated Huffman stream")
+    return data
+
+
+def _read_block(src):
+    """Read one framed block from a stream, returns (n_symbols, payload, padding, lengths), or None at the end"""
+    n_symbols, payload_size, padding, codebook_size = BLOCK_HEADER.unpack(_read_exactly(src, BLOCK_HEADER.size))
+    if n_symbols == 0:  # end marker
+        return None
+
+    lengths = deserialize_lengths(_read_exactly(src, codebook_size))
+    return n_symbols, _read_exactly(src, payload_size), padding, lengths
+
+
+def decode_block(n_symbols, payload, padding, lengths):
+    block = Canonical_Decoder(lengths).decode(payload, padding)
+    if len(block) != n_symbols:
+        raise ValueError("Corrupted Huffman block")
+    return block
+
+
+def read_blocks(src, block_size):
+    """Generator of the blocks of block_size bytes (the last one may be shorter) of a binary stream"""
+    while True:
+        block = src.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+def write_container(dst, block_size, frames):
+    """Write the file header, the framed blocks given as (n_symbols, frame) pairs, the end marker and the block
+    index. Returns the number of bytes read (encoded) and written"""
+    dst.write(FILE_HEADER.pack(MAGIC, block_size))
+    bytes_in, bytes_out = 0, FILE_HEADER.size
+    index = []  # (offset, n_symbols) of every block
+
+    for n_symbols, frame in frames:
+        index.append((bytes_out, n_symbols))
+        dst.write(frame)
+        bytes_in += n_symbols
+        bytes_out += len(frame)
+
+    index_offset = bytes_out + BLOCK_HEADER.size
+    dst.write(BLOCK_HEADER.pack(0, 0, 0, 0))
+    dst.write(struct.pack(">I", len(index)))
+    for entry in index:
+        dst.write(INDEX_ENTRY.pack(*entry))
+    dst.write(TRAILER.pack(index_offset, INDEX_MAGIC))
+
+    return bytes_in, index_offset + 4 + len(index) * INDEX_ENTRY.size + TRAILER.size
+
+
+def compress_stream(src, dst, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Compress a binary stream into a framed container, one block at a time.
+
+    The input is read in blocks of `block_size` bytes. Every block is encoded with its own canonical Huffman
+    codebook (the code lengths of its byte values), so only one block is held in memory at a time. An index of the
+    block offsets is appended at the end, for random access with `Block_Reader`.
+
+    Args:
+      src: binary file object to read from
+      dst: binary file object to write to
+      block_size(int): number of input bytes per block
+
+    Returns:
+       a tuple of the number of bytes read and the number of bytes written
+    """
+    if block_size <= 0:
+        raise ValueError("Block size must be a positive integer")
+
+    frames = ((len(block), encode_block(block)) for block in read_blocks(src, block_size))
+    return write_container(dst, block_size, frames)
+
+
+def _read_file_header(src):
+    magic, block_size = FILE_HEADER.unpack(_read_exactly(src, FILE_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a Huffman stream")
+    return block_size
+
+
+def read_frames(src):
+    """Generator of the parsed blocks (n_symbols, payload, padding, lengths) of a compressed stream, to be decoded
+    with `decode_block`"""
+    _read_file_header(src)
+    while True:
+        block = _read_block(src)
+        if block is None:
+            return
+        yield block
+
+
+def decompress_blocks(src):
+    """Generator of the decoded blocks (bytes) of a compressed stream, read sequentially (no seeking needed)"""
+    for block in read_frames(src):
+        yield decode_block(*block)
+
+
+def decompress_stream(src, dst):
+    """Decompress a stream written by `compress_stream` into dst, one block at a time. Returns the bytes written"""
+    bytes_out = 0
+    for block in decompress_blocks(src):
+        dst.write(block)
+        bytes_out += len(block)
+    return bytes_out
+
+
+class Block_Reader(object):
+    """Random access to a compressed file: decodes only the blocks holding the requested range of bytes.
+
+    The block index is read from the end of the file, so the file object must be seekable."""
+
+    def __init__(self, src):
+        self.src = src
+        src.seek(0)
+        self.block_size = _read_file_header(src)
+
+        src.seek(-TRAILER.size, 2)
+        index_offset, magic = TRAILER.unpack(_read_exactly(src, TRAILER.size))
+        if magic != INDEX_MAGIC:
+            raise ValueError("Huffman stream has no block index")
+
+        src.seek(index_offset)
+        n_blocks, = struct.unpack(">I", _read_exactly(src, 4))
+        self.offsets = []  # offset of each block in the compressed file
+        self.starts = []  # offset of each block in the decompressed data
+        self.size = 0
+        for _ in range(n_blocks):
+            offset, n_symbols = INDEX_ENTRY.unpack(_read_exactly(src, INDEX_ENTRY.size))
+            self.offsets.append(offset)
+            self.starts.append(self.size)
+            self.size += n_symbols
+
+    def __len__(self):
+        """Number of blocks"""
+        return len(self.offsets)
+
+    def read_block(self, i):
+        """Decode block i"""
+        self.src.seek(self.offsets[i])
+        return decode_block(*_read_block(self.src))
+
+    def read(self, offset, size):
+        """Read size bytes starting at a position of the decompressed data"""
+        if offset < 0:
+            raise ValueError(f"Negative offset: {offset}")
+        end = min(offset + size, self.size)
+        if offset >= end:
+            return b""
+
+        first = bisect.bisect_right(self.starts, offset) - 1
+        last = bisect.bisect_right(self.starts, end - 1) - 1
+        data = b"".join(self.read_block(i) for i in range(first, last + 1))
+        start = offset - self.starts[first]
+        return data[start:start + end - offset]
+
+
+def compress_file(in_path, out_path, block_size=DEFAULT_BLOCK_SIZE):
+    with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+        return compress_stream(src, dst, block_size)
+
+
+def decompress_file(in_path, out_path):
+    with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+        return decompress_stream(src, dst)
+
+
+if __name__ == "__main__":
+    import io
+    import random
+
+    # TEST #1: provided sentence, in blocks of 8 bytes
+    print("Test #1")
+    data = b"The bird is the word"
+    compressed = io.BytesIO()
+    print(compress_stream(io.BytesIO(data), compressed, block_size=8)[0])  # 20
+    compressed.seek(0)
+    print(b"".join(decompress_blocks(compressed)))  # b'The bird is the word'
+
+    # TEST #2: empty input, a single repetitive byte
+    print("Test #2")
+    for data in [b"", b"A", b"A"*10]:
+        compressed, decompressed = io.BytesIO(), io.BytesIO()
+        compress_stream(io.BytesIO(data), compressed, block_size=4)
+        compressed.seek(0)
+        decompress_stream(compressed, decompressed)
+        print(decompressed.getvalue() == data)  # True
+
+    # TEST #3: random access to the decompressed data
+    print("Test #3")
+    rnd = random.Random(0)
+    data = bytes(rnd.choice(b"abcdefgh\n") for _ in range(100000))
+    compressed = io.BytesIO()
+    compress_stream(io.BytesIO(data), compressed, block_size=4096)
+    reader = Block_Reader(compressed)
+    print(len(reader), reader.size)  # 25 100000
+    print(all(reader.read(offset, size) == data[offset:offset + size]
+              for offset, size in [(0, 10), (4090, 20), (5000, 10000), (99990, 100), (100000, 1)]))  # True
+    print(len(compressed.getvalue()) < len(data) / 2)  # True
+    try:
+        reader.read(-10, 5)
+    except ValueError as e:
+        print(e)  # Negative offset: -10
+
+    # TEST #4: a corrupted stream
+    print("Test #4")
+    try:
+        list(decompress_blocks(io.BytesIO(b"XXXX" + bytes(10))))
+    except ValueError as e:
+        print(e)  # Not a Huffman stream
@@ -0,0 +1,100 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from huffman_stream import (DEFAULT_BLOCK_SIZE, decode_block, encode_block, read_blocks, read_frames,
+                            write_container)
+
+
+def _encode_block_sized(block):
+    return len(block), encode_block(block)
+
+
+def _decode_frame(frame):
+    return decode_block(*frame)
+
+
+def _ordered_map(executor, function, items, max_pending):
+    """Like `executor.map`, but submits at most max_pending items ahead of the one being consumed, so only a few
+    blocks are held in memory however long the input is. Results come in the order of the items."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def compress_stream_parallel(src, dst, block_size=DEFAULT_BLOCK_SIZE, workers=4, max_pending=None):
+    """
+    Compress a binary stream like `compress_stream`, counting frequencies, building codes and encoding the blocks
+    in a pool of processes.
+
+    Every block is encoded independently and deterministically (ties in the code lengths are broken by symbol), and
+    the frames are written in the order of the blocks, so the output is byte-identical to `compress_stream`
+    whatever the number of workers.
+
+    Args:
+      src: binary file object to read from
+      dst: binary file object to write to
+      block_size(int): number of input bytes per block
+      workers(int): number of worker processes
+      max_pending(int): max number of blocks being encoded or waiting to be written, default 2 * workers
+
+    Returns:
+       a tuple of the number of bytes read and the number of bytes written
+    """
+    if block_size <= 0:
+        raise ValueError("Block size must be a positive integer")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = _ordered_map(executor, _encode_block_sized, read_blocks(src, block_size),
+                              max_pending or 2 * workers)
+        return write_container(dst, block_size, frames)
+
+
+def decompress_stream_parallel(src, dst, workers=4, max_pending=None):
+    """Decompress a stream written by `compress_stream` (or `compress_stream_parallel`), decoding the blocks in a
+    pool of processes. The frames are read sequentially, decoded blocks are written in order. Returns the bytes
+    written"""
+    bytes_out = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for block in _ordered_map(executor, _decode_frame, read_frames(src), max_pending or 2 * workers):
+            dst.write(block)
+            bytes_out += len(block)
+    return bytes_out
+
+
+if __name__ == "__main__":
+    import io
+    import random
+
+    from huffman_stream import compress_stream
+
+    rnd = random.Random(0)
+    data = bytes(rnd.choice(b"abcdefgh\n") for _ in range(200000))
+
+    # TEST #1: the output does not depend on the number of workers
+    print("Test #1")
+    sequential = io.BytesIO()
+    compress_stream(io.BytesIO(data), sequential, block_size=10000)
+    outputs = []
+    for workers in (1, 2, 4):
+        compressed = io.BytesIO()
+        compress_stream_parallel(io.BytesIO(data), compressed, block_size=10000, workers=workers)
+        outputs.append(compressed.getvalue())
+    print(all(output == sequential.getvalue() for output in outputs))  # True
+
+    # TEST #2: parallel decompression
+    print("Test #2")
+    decompressed = io.BytesIO()
+    sequential.seek(0)
+    print(decompress_stream_parallel(sequential, decompressed, workers=2))  # 200000
+    print(decompressed.getvalue() == data)  # True
+
+    # TEST #3: empty input
+    print("Test #3")
+    compressed, decompressed = io.BytesIO(), io.BytesIO()
+    compress_stream_parallel(io.BytesIO(b""), compressed)
+    compressed.seek(0)
+    print(decompress_stream_parallel(compressed, decompressed), decompressed.getvalue())  # 0 b''
@@ -98,13 +98,8 @@ def generate_huffman_code(node, code=''):
     return codes
 
 
-def huffman_encoding(data):
-    """Huffman encoding: given a string, outputs a tuple of encoded data, and a binary Huffman tree used to
-    decode the data"""
-
-    # if data is empty or None
-    if data is None or len(data) == 0:
-        return "", LeafNode("", 1)
+def build_huffman_tree(data):
+    """Given a non-empty string, builds the binary Huffman tree of its characters"""
 
     # Building frequency table (dict)
     frequencies = dict()
@@ -121,7 +116,18 @@ def huffman_encoding(data):
         n1, n2 = heapq.heappop(nodes), heapq.heappop(nodes)  # pops two elements
         heapq.heappush(nodes, n1+n2)  # adds to elements together, and pushes them onto a priority queue
 
-    tree = heapq.heappop(nodes)     # from a heap of one element extract our tree
+    return heapq.heappop(nodes)     # from a heap of one element extract our tree
+
+
+def huffman_encoding(data):
+    """Huffman encoding: given a string, outputs a tuple of encoded data, and a binary Huffman tree used to
+    decode the data"""
+
+    # if data is empty or None
+    if data is None or len(data) == 0:
+        return "", LeafNode("", 1)
+
+    tree = build_huffman_tree(data)
     codes = generate_huffman_code(tree)     # generate huffman codes from the tree
 
     # Encode data with the codes
@@ -155,6 +161,83 @@ def huffman_decoding(data, tree):
     return decoded_data
 
 
+def generate_huffman_code_bits(tree):
+    """Generate Huffman Codes from a constructed tree as (code, length) pairs of integers, instead of '0'/'1' strings.
+    The tree is traversed iteratively, with an explicit stack."""
+
+    codes = {}
+    stack = [(tree, 0, 0)]
+
+    while stack:
+        node, code, length = stack.pop()
+        if type(node) == LeafNode:
+            codes[node.char] = (code, length)
+        else:
+            stack.append((node.left, code << 1, length + 1))
+            stack.append((node.right, (code << 1) | 1, length + 1))
+
+    return codes
+
+
+def pack_bits(data, codes):
+    """Pack the codes of the data characters into bytes. Returns the bytes and the number of padding bits (0-7),
+    appended as zeros to fill the last byte."""
+
+    packed = bytearray()
+    acc, n_bits = 0, 0  # bits not yet written, and their number
+
+    for char in data:
+        code, length = codes[char]
+        acc = (acc << length) | code
+        n_bits += length
+
+        if n_bits >= 64:  # flush the whole bytes, keep the remaining bits
+            extra = n_bits & 7
+            packed += (acc >> extra).to_bytes((n_bits - extra) // 8, "big")
+            acc &= (1 << extra) - 1
+            n_bits = extra
+
+    padding = -n_bits % 8
+    packed += (acc << padding).to_bytes((n_bits + padding) // 8, "big")
+
+    return bytes(packed), padding
+
+
+def huffman_encoding_packed(data):
+    """Huffman encoding into a real binary form: given a string, outputs a tuple of the encoded bytes, the number of
+    padding bits in the last byte, and a binary Huffman tree used to decode the data"""
+
+    # if data is empty or None
+    if data is None or len(data) == 0:
+        return b"", 0, LeafNode("", 1)
+
+    tree = build_huffman_tree(data)
+    packed, padding = pack_bits(data, generate_huffman_code_bits(tree))
+    return packed, padding, tree
+
+
+def huffman_decoding_packed(data, padding, tree):
+    """Given bytes encoded by `huffman_encoding_packed`, the number of padding bits and the Huffman tree, outputs a
+    string containing the decoded data. The bits are read directly from the bytes."""
+
+    if len(data) == 0:  # a single character was encoded, and tree is just a single leaf
+        return tree.char * tree.freq
+
+    decoded_data = []
+    curr_node = tree
+    last = len(data) - 1
+
+    for i, byte in enumerate(data):
+        lowest = padding if i == last else 0  # the padding bits of the last byte are not decoded
+        for shift in range(7, lowest - 1, -1):
+            curr_node = curr_node.right if (byte >> shift) & 1 else curr_node.left
+            if type(curr_node) == LeafNode:
+                decoded_data.append(curr_node.char)
+                curr_node = tree
+
+    return "".join(decoded_data)
+
+
 if __name__ == "__main__":
 
     # TEST #0 : provided tests
@@ -231,3 +314,23 @@ if __name__ == "__main__":
 
     print(encoded_data)  # "AAAAAAAAAA"
     print(decoded_data == data)  # True
+
+    # TEST 6: bit-packed binary encoding
+    print("-"*10)
+    print("Test #6")
+
+    encoded_data, padding, tree = huffman_encoding_packed(a_great_sentence)
+    print(type(encoded_data).__name__, len(encoded_data), padding)  # bytes 9 2
+    print(huffman_decoding_packed(encoded_data, padding, tree) == a_great_sentence)  # True
+
+    # the packed bytes hold the same bits as the '0'/'1' string
+    bit_string, _ = huffman_encoding(a_great_sentence)
+    print(int.from_bytes(encoded_data, "big") >> padding == int(bit_string, base=2))  # True
+
+    # TEST 7: bit-packed binary encoding edge cases: empty string, a single repetitive character
+    print("-"*10)
+    print("Test #7")
+
+    for data in ["", "A"*10]:
+        encoded_data, padding, tree = huffman_encoding_packed(data)
+        print(encoded_data, huffman_decoding_packed(encoded_data, padding, tree) == data)  # b'' True
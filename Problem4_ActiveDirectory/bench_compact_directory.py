@@ -0,0 +1,98 @@
+"""Benchmark: memory and query latency of Group objects vs Compact_Directory on a large directory.
+
+Builds a tree of n_groups groups (10 sub-groups per group) plus some sub-groups shared by a second parent, with
+n_users users each added to `memberships` random groups, once as Group objects and once as a Compact_Directory.
+Like a load from a dump, every membership creates its own user name string: Group objects keep all of them, the
+compact directory keeps one per user. Memory is measured with tracemalloc.
+
+Usage: python bench_compact_directory.py [n_users] [n_groups] [memberships] [n_queries]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from compact_directory import Compact_Directory
+from problem_4 import Group, is_user_in_group_iter
+
+
+def edges(n_users, n_groups, memberships, seed=0):
+    """The (group, sub-group) and (group, user) edges of a random directory, as indexes"""
+    rnd = random.Random(seed)
+    group_edges = [(i // 10, i) for i in range(1, n_groups)]
+    group_edges += [(rnd.randrange(i), i) for i in range(10, n_groups, 10)]  # shared sub-groups
+    user_edges = [(rnd.randrange(n_groups), user) for user in range(n_users) for _ in range(memberships)]
+    return group_edges, user_edges
+
+
+def build_groups(group_names, group_edges, user_edges):
+    groups = [Group(name) for name in group_names]
+    for group, sub_group in group_edges:
+        groups[group].add_group(groups[sub_group])
+    for group, user in user_edges:
+        groups[group].add_user(f"user {user}")
+    return groups
+
+
+def build_compact(group_names, group_edges, user_edges):
+    directory = Compact_Directory()
+    for name in group_names:
+        directory.add_group(name)
+    for group, sub_group in group_edges:
+        directory.add_sub_group(group_names[group], group_names[sub_group])
+    for group, user in user_edges:
+        directory.add_user(group_names[group], f"user {user}")
+    return directory
+
+
+def measured(build, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, memory, elapsed
+
+
+def latency(query, queries):
+    start = time.perf_counter()
+    for user, group in queries:
+        query(user, group)
+    return (time.perf_counter() - start) / len(queries)
+
+
+if __name__ == "__main__":
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    n_groups = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    memberships = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    n_queries = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+
+    group_names = [f"group {i}" for i in range(n_groups)]
+    group_edges, user_edges = edges(n_users, n_groups, memberships)
+    print(f"{n_users} users, {n_groups} groups, {len(user_edges)} memberships")
+
+    groups, groups_memory, groups_time = measured(build_groups, group_names, group_edges, user_edges)
+    directory, compact_memory, compact_time = measured(build_compact, group_names, group_edges, user_edges)
+    print(f"{'Group objects':>18}: {groups_memory / 1e6:8.1f} MB, built in {groups_time:.2f}s")
+    print(f"{'Compact_Directory':>18}: {compact_memory / 1e6:8.1f} MB, built in {compact_time:.2f}s")
+
+    rnd = random.Random(1)
+    queries = [(f"user {rnd.randrange(n_users)}", rnd.randrange(min(n_groups, 100))) for _ in range(n_queries)]
+    group_queries = [(user, groups[group]) for user, group in queries]
+    name_queries = [(user, group_names[group]) for user, group in queries]
+
+    print(f"latency of {n_queries} queries on the top 100 groups (the largest subtrees):")
+    print(f"{'is_user_in_group_iter':>28}: {latency(is_user_in_group_iter, group_queries) * 1e3:10.3f} ms")
+    print(f"{'Compact_Directory, cold':>28}: {latency(directory.is_user_in_group, name_queries) * 1e3:10.3f} ms")
+    print(f"{'Compact_Directory, cached':>28}: {latency(directory.is_user_in_group, name_queries) * 1e3:10.3f} ms")
+    assert all(directory.is_user_in_group(*name_query) == is_user_in_group_iter(*group_query)
+               for name_query, group_query in zip(name_queries, group_queries))
+
+    directory.max_cache_bytes = float("inf")
+    start = time.perf_counter()
+    for name in group_names:
+        directory.effective_set(name)
+    elapsed = time.perf_counter() - start
+    print(f"effective sets of all {n_groups} groups: {directory.cache_bytes / 1e6:.1f} MB "
+          f"({n_groups * ((n_users + 7) // 8) / 1e6:.1f} MB as bitmaps), computed in {elapsed:.2f}s")
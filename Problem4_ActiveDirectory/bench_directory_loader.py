@@ -0,0 +1,79 @@
+"""Benchmark: startup time of a large directory, from a CSV dump into Group objects one call at a time, vs the bulk
+loader into a Compact_Directory, vs a binary snapshot.
+
+Writes a CSV dump of n_groups groups (a tree with 10 sub-groups per group) and n_memberships user memberships of
+n_memberships / 5 users, in a temporary directory.
+
+Usage: python bench_directory_loader.py [n_groups] [n_memberships]
+"""
+import csv
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from directory_loader import load_directory, load_snapshot, read_csv, save_snapshot
+from membership_index import Membership_Index
+from problem_4 import Group
+
+
+def write_dump(path, n_groups, n_memberships, seed=0):
+    rnd = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["group", "kind", "member"])
+        writer.writerows((f"group {i // 10}", "group", f"group {i}") for i in range(1, n_groups))
+        writer.writerows((f"group {rnd.randrange(n_groups)}", "user", f"user {rnd.randrange(n_memberships // 5)}")
+                         for _ in range(n_memberships))
+
+
+def load_groups(path):
+    """Build Group objects from the dump, calling add_user/add_group for every membership"""
+    groups = dict()
+    for group, kind, member in read_csv(path):
+        if group not in groups:
+            groups[group] = Group(group)
+        if kind == "user":
+            groups[group].add_user(member)
+        else:
+            if member not in groups:
+                groups[member] = Group(member)
+            groups[group].add_group(groups[member])
+    return groups
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_groups = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_memberships = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+
+    tmp_dir = tempfile.mkdtemp()
+    dump_path = os.path.join(tmp_dir, "directory.csv")
+    snapshot_path = os.path.join(tmp_dir, "directory.snapshot")
+    write_dump(dump_path, n_groups, n_memberships)
+    print(f"{n_groups} groups, {n_memberships} memberships, dump of {os.path.getsize(dump_path) / 1e6:.1f} MB")
+
+    groups, groups_time = timed(load_groups, dump_path)
+    _, index_time = timed(Membership_Index, groups["group 0"])
+    del groups  # each representation is timed alone in memory (groups refer to their parents: a cycle)
+    gc.collect()
+    directory, loader_time = timed(load_directory, dump_path)
+    _, save_time = timed(save_snapshot, directory, snapshot_path)
+    loaded, snapshot_time = timed(load_snapshot, snapshot_path)
+    assert loaded.users == directory.users and loaded.sub_groups == directory.sub_groups
+
+    print(f"{'Group objects, one call at a time':>36}: {groups_time:.2f}s, "
+          f"and {index_time:.2f}s more for a Membership_Index")
+    print(f"{'bulk loader, Compact_Directory':>36}: {loader_time:.2f}s")
+    print(f"{'snapshot':>36}: {snapshot_time:.2f}s "
+          f"({os.path.getsize(snapshot_path) / 1e6:.1f} MB, saved in {save_time:.2f}s)")
+
+    shutil.rmtree(tmp_dir)
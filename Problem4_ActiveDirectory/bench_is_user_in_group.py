@@ -0,0 +1,79 @@
+"""Benchmark: recursive vs iterative (visited set) membership checks on deep and on wide, heavily shared hierarchies.
+
+- deep: a chain of n_levels groups, with the user in the last one. The recursive search fails once the chain is
+  deeper than the recursion limit.
+- shared: `layers` layers of `width` groups, every group containing all the groups of the next layer. A group of
+  layer k is reached by width^k paths, and the recursive search follows every one of them when the user is absent.
+
+Usage: python bench_is_user_in_group.py [n_levels] [width]
+"""
+import sys
+import time
+
+from membership_index import Membership_Index
+from problem_4 import Group, is_user_in_group, is_user_in_group_iter
+
+RECURSIVE_TIME_LIMIT = 5.0  # seconds, larger shared hierarchies are not searched recursively
+
+
+def deep_hierarchy(n_levels):
+    groups = [Group(f"level {i}") for i in range(n_levels)]
+    for upper, lower in zip(groups, groups[1:]):
+        upper.add_group(lower)
+    groups[-1].add_user("user")
+    return groups[0]
+
+
+def shared_hierarchy(layers, width):
+    root = Group("root")
+    above = [root]
+    for layer in range(layers):
+        below = [Group(f"layer {layer} group {i}") for i in range(width)]
+        for group in above:
+            for sub_group in below:
+                group.add_group(sub_group)
+        above = below
+    above[-1].add_user("user")
+    return root
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+    except RecursionError:
+        result = "RecursionError"
+    return result, time.perf_counter() - start
+
+
+def index_query(user, group):
+    return Membership_Index(group).is_member(user, group)
+
+
+if __name__ == "__main__":
+    n_levels = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    searches = {"recursive": is_user_in_group, "iterative": is_user_in_group_iter, "index (build + query)": index_query}
+
+    print(f"deep: a chain of {n_levels} groups")
+    root = deep_hierarchy(n_levels)
+    for name, search in searches.items():
+        for user in ("user", "absent"):
+            result, elapsed = timed(search, user, root)
+            print(f"{name:>22} {user:>7}: {result} in {elapsed:.4f}s")
+
+    print(f"shared: layers of {width} groups, each containing all the groups of the next layer")
+    recursive_time = 0
+    for layers in range(2, 15):
+        root = shared_hierarchy(layers, width)
+        line = []
+        for name, search in searches.items():
+            if name == "recursive" and recursive_time > RECURSIVE_TIME_LIMIT:
+                line.append(f"{name} skipped")
+                continue
+            result, elapsed = timed(search, "absent", root)
+            line.append(f"{name} {elapsed:.4f}s")
+            if name == "recursive":
+                recursive_time = elapsed
+        print(f"{layers:>4} layers ({width ** layers} paths): " + ", ".join(line))
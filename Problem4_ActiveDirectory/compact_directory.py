@@ -0,0 +1,237 @@
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure-Python path is used without it
+    np = None
+
+
+class Compact_Directory(object):
+    """A memory-compact directory of groups and users for very large hierarchies.
+
+    User and group names are interned to consecutive integer IDs. The direct members of a group are stored as
+    arrays of 4-byte IDs (`array('I')`) instead of lists of references to `Group` objects and name strings.
+
+    The effective users of a group (at any depth) are stored in the smaller of two forms: a sorted array of user
+    IDs (4 bytes per effective user, queried with a binary search) when the memberships reached from the group are
+    fewer than 1/32 of the number of users, otherwise a bitmap with one bit per user ID (n_users / 8 bytes, queried
+    with a single bit test). The bitmaps already computed for sub-groups are ORed in as whole integers, and the
+    bits of the other users are set (vectorized with numpy when installed). The effective sets are cached in an LRU
+    cache of at most `max_cache_bytes` bytes, and the cache is cleared by every change of the directory, so the
+    directory is meant to be loaded first and queried afterwards."""
+
+    def __init__(self, max_cache_bytes=256 * 2 ** 20):
+        self.user_ids = dict()  # user name -> ID
+        self.user_names = []  # ID -> user name
+        self.group_ids = dict()  # group name -> ID
+        self.group_names = []  # ID -> group name
+        self.users = []  # group ID -> array of the IDs of its direct users
+        self.sub_groups = []  # group ID -> array of the IDs of its direct sub-groups
+        # group ID -> effective users, a sorted array('I') of user IDs or a bitmap (bytes, bit i of byte i // 8 for
+        # user i), least recently used first
+        self.effective = OrderedDict()
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_bytes = 0
+
+    def _user_id(self, user):
+        user_id = self.user_ids.get(user)
+        if user_id is None:
+            user_id = self.user_ids[user] = len(self.user_names)
+            self.user_names.append(user)
+        return user_id
+
+    def add_group(self, group):
+        """Intern a group name, returns its ID"""
+        group_id = self.group_ids.get(group)
+        if group_id is None:
+            group_id = self.group_ids[group] = len(self.group_names)
+            self.group_names.append(group)
+            self.users.append(array("I"))
+            self.sub_groups.append(array("I"))
+        return group_id
+
+    def add_user(self, group, user):
+        self.users[self.add_group(group)].append(self._user_id(user))
+        self.clear_cache()
+
+    def add_sub_group(self, group, sub_group):
+        self.sub_groups[self.add_group(group)].append(self.add_group(sub_group))
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Drop the cached effective sets, after a change of the directory"""
+        self.effective.clear()
+        self.cache_bytes = 0
+
+    def add_edges(self, edges):
+        """Add many memberships at once, from an iterable of (group, "user", user name) and
+        (group, "group", sub-group name) tuples: the edges are consumed one at a time, so they can be streamed"""
+        group_ids, user_ids, users = self.group_ids, self.user_ids, self.users
+        n_users = len(user_ids)
+        try:
+            for group, kind, member in edges:
+                group_id = group_ids.get(group)
+                if group_id is None:
+                    group_id = self.add_group(group)
+
+                if kind == "user":
+                    # a new user gets the next ID in one dictionary operation, its name is appended at the end
+                    users[group_id].append(user_ids.setdefault(member, len(user_ids)))
+                elif kind == "group":
+                    self.sub_groups[group_id].append(self.add_group(member))
+                else:
+                    raise ValueError(f"Unknown kind of member: {kind!r}")
+        finally:
+            self.user_names.extend(islice(user_ids, n_users, None))  # dictionaries keep the insertion order
+            self.clear_cache()
+
+    @classmethod
+    def from_group(cls, group):
+        """Convert a hierarchy of `Group` objects (a group and all its sub-groups) into a compact directory"""
+        directory = cls()
+        directory.add_group(group.get_name())
+        visited = {group}
+        stack = [group]
+        while stack:
+            current = stack.pop()
+            for user in current.get_users():
+                directory.add_user(current.get_name(), user)
+            for sub_group in current.get_groups():
+                directory.add_sub_group(current.get_name(), sub_group.get_name())
+                if sub_group not in visited:
+                    visited.add(sub_group)
+                    stack.append(sub_group)
+        return directory
+
+    def _effective(self, group_id):
+        """The effective users of a group, as a sorted array of IDs or a bitmap: the users of the groups reachable
+        from it, without descending into the groups whose effective users are already known"""
+        n_bytes = (len(self.user_names) + 7) // 8
+        bitmaps = []  # known bitmaps, to be ORed in
+        user_ids = array("I")  # direct users of the reachable groups, and known sparse sets
+        visited = {group_id}
+        stack = [group_id]
+        while stack:
+            current = stack.pop()
+            effective = self.effective.get(current)
+            if effective is not None:
+                if isinstance(effective, array):
+                    user_ids.extend(effective)
+                else:
+                    bitmaps.append(effective)
+                continue
+            user_ids.extend(self.users[current])
+            for sub_group in self.sub_groups[current]:
+                if sub_group not in visited:
+                    visited.add(sub_group)
+                    stack.append(sub_group)
+
+        if not bitmaps and user_ids.itemsize * len(user_ids) < n_bytes:  # smaller than a bitmap, even with repeats
+            return array("I", sorted(set(user_ids)))
+
+        if np is not None:
+            bits = np.zeros(n_bytes * 8, dtype=bool)
+            bits[np.frombuffer(user_ids, dtype=np.uint32)] = True
+            bitmap = np.packbits(bits, bitorder="little").tobytes()
+        else:
+            bitmap = bytearray(n_bytes)
+            for user_id in user_ids:
+                bitmap[user_id >> 3] |= 1 << (user_id & 7)
+
+        if bitmaps:
+            known = 0
+            for other in bitmaps:
+                known |= int.from_bytes(other, "little")
+            bitmap = (int.from_bytes(bitmap, "little") | known).to_bytes(n_bytes, "little")
+        return bytes(bitmap)
+
+    def effective_set(self, group):
+        """The effective users of a group (cached): a sorted array('I') of user IDs, or a bitmap where bit i of byte
+        i // 8 is set for user ID i"""
+        group_id = self.group_ids[group]
+        effective = self.effective.get(group_id)
+        if effective is not None:
+            self.effective.move_to_end(group_id)
+            return effective
+
+        effective = self.effective[group_id] = self._effective(group_id)
+        self.cache_bytes += _size(effective)
+        while self.cache_bytes > self.max_cache_bytes and len(self.effective) > 1:
+            self.cache_bytes -= _size(self.effective.popitem(last=False)[1])
+        return effective
+
+    def is_user_in_group(self, user, group):
+        """Return True if user is in the group (or any of its sub-groups), False otherwise"""
+        user_id = self.user_ids.get(user)
+        if user_id is None or group not in self.group_ids:
+            return False
+        effective = self.effective_set(group)
+        if isinstance(effective, array):
+            i = bisect_left(effective, user_id)
+            return i < len(effective) and effective[i] == user_id
+        return effective[user_id >> 3] >> (user_id & 7) & 1 == 1
+
+    def effective_users(self, group):
+        """The names of the effective users of a group"""
+        effective = self.effective_set(group)
+        if isinstance(effective, array):
+            return [self.user_names[user_id] for user_id in effective]
+        bitmap = int.from_bytes(effective, "little")
+        return [name for user_id, name in enumerate(self.user_names) if bitmap >> user_id & 1]
+
+
+def _size(effective):
+    """The size in bytes of the data of an effective set"""
+    return effective.itemsize * len(effective) if isinstance(effective, array) else len(effective)
+
+
+if __name__ == "__main__":
+    import random
+
+    from problem_4 import Group, is_user_in_group_iter
+
+    # Test 1: provided test
+    print("---\nTest#1")
+    directory = Compact_Directory()
+    directory.add_user("subchild", "sub_child_user")
+    directory.add_sub_group("child", "subchild")
+    directory.add_sub_group("parent", "child")
+    print(directory.is_user_in_group("sub_child_user", "parent"))  # True
+    print(directory.is_user_in_group("notpresent", "parent"))  # False
+    print(directory.is_user_in_group("sub_child_user", "no such group"))  # False
+
+    # Test 2: a cycle, and changes after a query
+    print("---\nTest#2")
+    directory.add_sub_group("subchild", "parent")
+    directory.add_user("child", "child user")
+    print(directory.effective_users("subchild"))  # ['sub_child_user', 'child user']
+    directory.add_group("empty")
+    print(directory.effective_users("empty"))  # []
+
+    # Test 3: the same answers as Group objects, on a random hierarchy
+    print("---\nTest#3")
+    groups = [Group(f"group {i}") for i in range(300)]
+    for i in range(1, 300):
+        groups[random.randrange(i)].add_group(groups[i])
+        if random.random() < 0.2:
+            groups[i].add_group(groups[random.randrange(300)])
+        for _ in range(3):
+            groups[i].add_user(f"user {random.randrange(500)}")
+    directory = Compact_Directory.from_group(groups[0])
+    users = [f"user {i}" for i in range(500)]
+    print(all(directory.is_user_in_group(user, group.get_name()) == is_user_in_group_iter(user, group)
+              for group in groups for user in users))  # True
+
+    # Test 4: small groups are stored as sorted arrays, large ones as bitmaps, in a cache of bounded size
+    print("---\nTest#4")
+    directory.add_user("tiny", "user 0")
+    print(type(directory.effective_set("group 0")).__name__,
+          type(directory.effective_set("tiny")).__name__)  # bytes array
+    directory = Compact_Directory.from_group(groups[0])
+    directory.max_cache_bytes = 1000
+    print(all(directory.is_user_in_group(user, group.get_name()) == is_user_in_group_iter(user, group)
+              for group in groups for user in users))  # True
+    print(0 < directory.cache_bytes <= 1000)  # True
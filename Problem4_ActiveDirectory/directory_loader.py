@@ -0,0 +1,250 @@
+import csv
+import os
+import re
+import struct
+import sys
+from array import array
+
+from compact_directory import Compact_Directory
+
+# Snapshot format: SNAPSHOT_HEADER (magic, byte order of the arrays, number of users, number of groups, sizes in
+# bytes of the user names and group names), the names (UTF-8, separated by NUL characters), then for the users and
+# for the sub-groups: the offsets (uint64, n_groups + 1) and the IDs (uint32) of the members of all groups in a row.
+SNAPSHOT_MAGIC = b"ADS1"
+SNAPSHOT_HEADER = struct.Struct("<4scQQQQ")
+SEPARATOR = "\0"
+_DN_COMPONENT = re.compile(r"(?<!\\),")  # a comma not escaped by a backslash
+
+
+def read_csv(path):
+    """
+    Generator of the memberships of a CSV dump, one `group,kind,member` row per membership, where kind is "user" or
+    "group". A `group,kind,member` header row and empty rows are skipped.
+
+    Returns:
+       a generator of [group, kind, member] lists
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) != 3:
+                if not row:
+                    continue
+                raise ValueError(f"Expected 3 fields, got {len(row)}: {row}")
+            if row[0] == "group" and row[1] == "kind":
+                continue
+            yield row
+
+
+def _cn(dn):
+    """The value of the first component of a distinguished name: 'cn=admins\\, europe,ou=groups' -> 'admins, europe'"""
+    first = _DN_COMPONENT.split(dn, 1)[0]
+    value = first.split("=", 1)[1] if "=" in first else first
+    return value.strip().replace("\\,", ",")
+
+
+def read_ldif(path):
+    """
+    Generator of the memberships of an LDIF-like dump: records separated by empty lines, each starting with the
+    `dn:` of a group, followed by `memberUid:` lines (users) and `member:` lines (distinguished names of
+    sub-groups). Comments (#) and other attributes are skipped.
+
+    Returns:
+       a generator of (group, kind, member) tuples
+    """
+    group = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                group = None
+                continue
+            if line.startswith("#") or ":" not in line:
+                continue
+
+            attribute, value = line.split(":", 1)
+            attribute, value = attribute.strip().lower(), value.strip()
+            if attribute == "dn":
+                group = _cn(value)
+            elif group is None:
+                raise ValueError(f"Attribute outside of a record: {line}")
+            elif attribute == "memberuid":
+                yield group, "user", value
+            elif attribute == "member":
+                yield group, "group", _cn(value)
+
+
+def load_directory(path):
+    """Build a Compact_Directory in one pass over a dump, CSV or LDIF-like (by the extension .ldif)"""
+    directory = Compact_Directory()
+    directory.add_edges(read_ldif(path) if path.endswith(".ldif") else read_csv(path))
+    return directory
+
+
+def _write_csr(f, lists, swap):
+    offsets, ids = array("Q", [0]), array("I")
+    for members in lists:
+        ids.extend(members)
+        offsets.append(len(ids))
+    if swap:
+        offsets.byteswap()
+        ids.byteswap()
+    offsets.tofile(f)
+    ids.tofile(f)
+
+
+def _read_csr(f, n_groups, swap):
+    offsets = array("Q")
+    offsets.fromfile(f, n_groups + 1)
+    if swap:
+        offsets.byteswap()
+    remaining = os.fstat(f.fileno()).st_size - f.tell()
+    if offsets[0] != 0 or any(offsets[i] > offsets[i + 1] for i in range(n_groups)) \
+            or offsets[-1] * array("I").itemsize > remaining:
+        raise ValueError("Corrupted snapshot: invalid offsets")
+
+    ids = array("I")
+    ids.fromfile(f, offsets[-1])
+    if swap:
+        ids.byteswap()
+    return [ids[offsets[i]:offsets[i + 1]] for i in range(n_groups)]
+
+
+def save_snapshot(directory, path, byte_order=sys.byteorder):
+    """Save a Compact_Directory to a binary snapshot file, loaded much faster than the dump it was built from. The
+    arrays are written in byte_order ("little" or "big"), by default the one of this machine."""
+    for names in (directory.user_names, directory.group_names):
+        for name in names:
+            if SEPARATOR in name:
+                raise ValueError(f"Name with a NUL character: {name!r}")
+
+    user_names = SEPARATOR.join(directory.user_names).encode("utf-8")
+    group_names = SEPARATOR.join(directory.group_names).encode("utf-8")
+    swap = byte_order != sys.byteorder
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, b"<" if byte_order == "little" else b">",
+                                     len(directory.user_names), len(directory.group_names), len(user_names),
+                                     len(group_names)))
+        f.write(user_names)
+        f.write(group_names)
+        _write_csr(f, directory.users, swap)
+        _write_csr(f, directory.sub_groups, swap)
+    os.replace(tmp_path, path)
+
+
+def _split_names(blob, count):
+    names = blob.decode("utf-8").split(SEPARATOR) if count else []
+    if len(names) != count:
+        raise ValueError("Corrupted snapshot: wrong number of names")
+    return names
+
+
+def load_snapshot(path):
+    """Load a Compact_Directory saved by `save_snapshot`"""
+    with open(path, "rb") as f:
+        header = f.read(SNAPSHOT_HEADER.size)
+        if len(header) != SNAPSHOT_HEADER.size:
+            raise ValueError("Not a directory snapshot")
+        magic, byte_order, n_users, n_groups, user_names_size, group_names_size = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a directory snapshot")
+
+        directory = Compact_Directory()
+        directory.user_names = _split_names(f.read(user_names_size), n_users)
+        directory.group_names = _split_names(f.read(group_names_size), n_groups)
+        directory.user_ids = dict(zip(directory.user_names, range(n_users)))
+        directory.group_ids = dict(zip(directory.group_names, range(n_groups)))
+
+        swap = byte_order != (b"<" if sys.byteorder == "little" else b">")
+        try:
+            directory.users = _read_csr(f, n_groups, swap)
+            directory.sub_groups = _read_csr(f, n_groups, swap)
+        except EOFError:
+            raise ValueError("Truncated directory snapshot")
+    return directory
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    tmp_dir = tempfile.mkdtemp()
+
+    # Test 1: a CSV dump
+    print("---\nTest#1")
+    csv_path = os.path.join(tmp_dir, "directory.csv")
+    with open(csv_path, "w") as f:
+        f.write("group,kind,member\n"
+                "parent,group,child\n"
+                "child,group,subchild\n"
+                "subchild,user,sub_child_user\n"
+                "\"admins, europe\",user,\"O'Brien, Pat\"\n"
+                "parent,group,\"admins, europe\"\n")
+    directory = load_directory(csv_path)
+    print(directory.is_user_in_group("sub_child_user", "parent"))  # True
+    print(directory.is_user_in_group("O'Brien, Pat", "parent"), directory.is_user_in_group("O'Brien, Pat", "child"))
+    # True False
+
+    # Test 2: the same directory as an LDIF-like dump
+    print("---\nTest#2")
+    ldif_path = os.path.join(tmp_dir, "directory.ldif")
+    with open(ldif_path, "w") as f:
+        f.write("# a comment\n"
+                "dn: cn=parent,ou=groups\n"
+                "objectClass: groupOfNames\n"
+                "member: cn=child,ou=groups\n"
+                "member: cn=admins\\, europe,ou=groups\n"
+                "\n"
+                "dn: cn=child,ou=groups\n"
+                "member: cn=subchild,ou=groups\n"
+                "\n"
+                "dn: cn=subchild,ou=groups\n"
+                "memberUid: sub_child_user\n")
+    ldif_directory = load_directory(ldif_path)
+    print(ldif_directory.is_user_in_group("sub_child_user", "parent"))  # True
+    print(sorted(ldif_directory.group_ids))  # ['admins, europe', 'child', 'parent', 'subchild']
+
+    # Test 3: a snapshot loads the same directory
+    print("---\nTest#3")
+    snapshot_path = os.path.join(tmp_dir, "directory.snapshot")
+    save_snapshot(directory, snapshot_path)
+    loaded = load_snapshot(snapshot_path)
+    print(loaded.user_names == directory.user_names, loaded.users == directory.users,
+          loaded.sub_groups == directory.sub_groups)  # True True True
+    print(loaded.is_user_in_group("O'Brien, Pat", "parent"))  # True
+    save_snapshot(Compact_Directory(), snapshot_path)
+    print(load_snapshot(snapshot_path).group_names)  # []
+    other_byte_order = "big" if sys.byteorder == "little" else "little"
+    save_snapshot(directory, snapshot_path, byte_order=other_byte_order)  # as written by another machine
+    swapped = load_snapshot(snapshot_path)
+    print(swapped.users == directory.users, swapped.sub_groups == directory.sub_groups)  # True True
+
+    # Test 4: invalid input
+    print("---\nTest#4")
+    with open(csv_path, "w") as f:
+        f.write("parent,manager,alice\n")
+    try:
+        load_directory(csv_path)
+    except ValueError as e:
+        print(e)  # Unknown kind of member: 'manager'
+    try:
+        load_snapshot(csv_path)
+    except ValueError as e:
+        print(e)  # Not a directory snapshot
+    save_snapshot(directory, snapshot_path, byte_order=sys.byteorder)
+    with open(snapshot_path, "r+b") as f:  # a huge number of IDs in the last offset of the users
+        f.seek(SNAPSHOT_HEADER.size + len(SEPARATOR.join(directory.user_names).encode())
+               + len(SEPARATOR.join(directory.group_names).encode()) + 8 * len(directory.group_names))
+        f.write(b"\xff" * 8)
+    try:
+        load_snapshot(snapshot_path)
+    except ValueError as e:
+        print(e)  # Corrupted snapshot: invalid offsets
+    directory.add_user("parent", "bad\0name")
+    try:
+        save_snapshot(directory, snapshot_path)
+    except ValueError as e:
+        print(e)  # Name with a NUL character: 'bad\x00name'
+
+    shutil.rmtree(tmp_dir)
@@ -0,0 +1,139 @@
+from problem_4 import Group, is_user_in_group
+
+
+class Membership_Index(object):
+    """An index of the effective users of groups (their own users and the users of all their sub-groups, at any
+    depth), answering membership queries with a single set lookup.
+
+    The index registers itself as a listener of every indexed group, so `Group.add_user` and `Group.add_group`
+    update it incrementally: the new users are propagated upwards through the parents of the group. The propagation
+    stops at every group that already has them, because then all of its ancestors have them too. A cycle of groups
+    is harmless, since the effective sets only grow.
+
+    Groups hold their listeners by weak references, so an index that is no longer used is freed and stops being
+    updated. `close` detaches an index from its groups right away."""
+
+    def __init__(self, *groups):
+        self.effective = dict()  # group -> set of effective users
+        for group in groups:
+            self.add(group)
+
+    def add(self, group):
+        """Index a group and all of its sub-groups"""
+        if group in self.effective:
+            return
+
+        new_groups = []
+        self.effective[group] = set()
+        stack = [group]
+        while stack:  # register the groups not indexed yet, without descending into already indexed ones
+            current = stack.pop()
+            current.add_listener(self)
+            new_groups.append(current)
+            for sub_group in current.get_groups():
+                if sub_group not in self.effective:
+                    self.effective[sub_group] = set()
+                    stack.append(sub_group)
+
+        for current in new_groups:
+            self._propagate(current, current.get_users())
+            for sub_group in current.get_groups():
+                self._propagate(current, self.effective[sub_group])
+
+    def _propagate(self, group, users):
+        """Add users to the effective set of a group and of all its indexed ancestors"""
+        stack = [(group, users)]
+        while stack:
+            current, users = stack.pop()
+            effective = self.effective[current]
+            new_users = [user for user in users if user not in effective]
+            if not new_users:
+                continue
+            effective.update(new_users)
+            for parent in current.parents:
+                if parent in self.effective:
+                    stack.append((parent, new_users))
+
+    def close(self):
+        """Stop listening to the changes of the indexed groups, and drop the index"""
+        for group in self.effective:
+            group.remove_listener(self)
+        self.effective.clear()
+
+    # listener callbacks, called by Group
+    def user_added(self, group, user):
+        self._propagate(group, (user,))
+
+    def group_added(self, group, sub_group):
+        if sub_group not in self.effective:
+            self.add(sub_group)  # also propagates its users up to group, which is one of its parents
+        else:
+            self._propagate(group, self.effective[sub_group])
+
+    def is_member(self, user, group):
+        """Return True if user is in the group (or any of its sub-groups), False otherwise. O(1) once the group
+        is indexed, a group not indexed yet is indexed first."""
+        if group not in self.effective:
+            self.add(group)
+        return user in self.effective[group]
+
+    def effective_users(self, group):
+        """The set of effective users of a group (not to be modified)"""
+        if group not in self.effective:
+            self.add(group)
+        return self.effective[group]
+
+
+if __name__ == "__main__":
+    import random
+
+    # Test 1: provided test
+    print("---\nTest#1")
+    parent = Group("parent")
+    child = Group("child")
+    sub_child = Group("subchild")
+    sub_child.add_user("sub_child_user")
+    child.add_group(sub_child)
+    parent.add_group(child)
+
+    index = Membership_Index(parent)
+    print(index.is_member("sub_child_user", parent))  # True
+    print(index.is_member("notpresent", parent))  # False
+
+    # Test 2: incremental updates, after the groups are indexed
+    print("---\nTest#2")
+    sub_child.add_user("new user")
+    print(index.is_member("new user", parent), index.is_member("new user", child))  # True True
+    other = Group("other")
+    other.add_user("other user")
+    child.add_group(other)
+    print(index.is_member("other user", parent), index.is_member("other user", sub_child))  # True False
+
+    # Test 3: a cycle of groups
+    print("---\nTest#3")
+    sub_child.add_group(parent)
+    sub_child.add_user("cycle user")
+    print(index.is_member("cycle user", other), index.is_member("cycle user", parent))  # False True
+    print(sorted(index.effective_users(sub_child)))
+    # ['cycle user', 'new user', 'other user', 'sub_child_user']
+
+    # Test 4: the index agrees with is_user_in_group on a random hierarchy built while indexed
+    print("---\nTest#4")
+    groups = [Group(f"group {i}") for i in range(200)]
+    index = Membership_Index(groups[0])
+    for i in range(1, 200):
+        groups[random.randrange(i)].add_group(groups[i])  # a random DAG, rooted at group 0
+        if random.random() < 0.3:
+            groups[random.randrange(i)].add_group(groups[i])
+        groups[i].add_user(f"user {random.randrange(100)}")
+    users = [f"user {i}" for i in range(100)]
+    print(all(index.is_member(user, group) == is_user_in_group(user, group) for user in users for group in groups))
+    # True
+
+    # Test 5: indexes do not pile up in the listeners of the groups
+    print("---\nTest#5")
+    index.close()
+    print(len(groups[0].listeners or ()))  # 0
+    for _ in range(10):
+        Membership_Index(groups[0]).is_member("user 0", groups[0])
+    print(len(groups[0].listeners or ()))  # 0
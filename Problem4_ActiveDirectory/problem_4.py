@@ -1,14 +1,36 @@
+import weakref
+
+
 class Group(object):
     def __init__(self, _name):
         self.name = _name
         self.groups = []
         self.users = []
+        self.parents = []  # groups this group was added to
+        self.listeners = None  # indexes notified of every change (a WeakSet, created by the first one)
 
     def add_group(self, group):
         self.groups.append(group)
+        group.parents.append(self)
+        if self.listeners:
+            for listener in list(self.listeners):
+                listener.group_added(self, group)
 
     def add_user(self, user):
         self.users.append(user)
+        if self.listeners:
+            for listener in list(self.listeners):
+                listener.user_added(self, user)
+
+    def add_listener(self, listener):
+        """Notify an index of the changes of this group, see membership_index.py. Held by a weak reference."""
+        if self.listeners is None:
+            self.listeners = weakref.WeakSet()
+        self.listeners.add(listener)
+
+    def remove_listener(self, listener):
+        if self.listeners is not None:
+            self.listeners.discard(listener)
 
     def get_groups(self):
         return self.groups
@@ -40,6 +62,51 @@ def is_user_in_group(user, group):
     return False
 
 
+def is_user_in_group_iter(user, group, memo=None):
+    """
+    Return True if user is in the group, False otherwise, with an iterative depth-first search.
+
+    Every group is visited at most once (a visited set), so a sub-group shared by many parents is explored once, and
+    a cycle of groups does not loop forever. The results are memoized in `memo`, a dictionary of group -> bool for
+    this user: when the user is found, every group on the path to it contains the user; when not, none of the
+    visited groups does. Passing the same memo to the next query of the same user skips the groups already known.
+
+    Args:
+      user(str): user name/id
+      group(class:Group): group to check user membership against
+      memo(dict): group -> bool, results of previous queries of the same user
+    """
+
+    if memo is None:
+        memo = dict()
+    if group in memo:
+        return memo[group]
+
+    visited = {group}
+    stack = [(group, iter(group.get_groups()))]  # the path from group to the current sub-group
+    found = user in group.get_users()
+
+    while stack and not found:
+        sub_group = next(stack[-1][1], None)
+        if sub_group is None:  # all sub-groups explored
+            stack.pop()
+            continue
+        if sub_group in visited or memo.get(sub_group) is False:
+            continue
+
+        visited.add(sub_group)
+        found = memo.get(sub_group) is True or user in sub_group.get_users()
+        stack.append((sub_group, iter(sub_group.get_groups())))
+
+    if found:
+        for path_group, _ in stack:
+            memo[path_group] = True
+    else:
+        for visited_group in visited:
+            memo[visited_group] = False
+    return found
+
+
 if __name__ == "__main__":
 
     # Test 1: provided test
@@ -112,3 +179,23 @@ if __name__ == "__main__":
 
     print(is_user_in_group(external_user,group1))  # False
     print(is_user_in_group(external_user, group2))  # False
+
+    # TEST #5: iterative search gives the same results, also with a shared memo
+    print("Test#5")
+    memo = dict()
+    print(is_user_in_group_iter("sss group 2 user", group1, memo))  # True
+    print(memo[s_group2], memo[sss_group2], s_group1 in memo)  # True True True
+    print(is_user_in_group_iter("sss group 2 user", ss_group2, memo))  # True
+    print(is_user_in_group_iter("group 2 user", group1), is_user_in_group_iter(external_user, group2))  # False False
+
+    # TEST #6 (edge case). A cycle of groups, and a very deep hierarchy
+    print("Test#6")
+    s_group2.add_group(group1)
+    print(is_user_in_group_iter("not present", group1))  # False
+    print(is_user_in_group_iter("group 1 user", s_group2))  # True
+
+    deep = [Group(f"level {i}") for i in range(10000)]
+    for upper, lower in zip(deep, deep[1:]):
+        upper.add_group(lower)
+    deep[-1].add_user("deep user")
+    print(is_user_in_group_iter("deep user", deep[0]))  # True
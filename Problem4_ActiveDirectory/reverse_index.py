@@ -0,0 +1,142 @@
+from problem_4 import Group, is_user_in_group_iter
+
+
+class Reverse_Index(object):
+    """A reverse index of a hierarchy of groups: from each user to the groups it was added to directly, and (with
+    `Group.parents`) from each group to the groups containing it. `groups_of(user)` climbs from the direct groups
+    of the user to all their ancestors in one upward traversal, and caches the result.
+
+    Like `Membership_Index`, the index registers itself as a listener of every indexed group, and keeps the cached
+    results correct as `Group.add_user` and `Group.add_group` change the hierarchy: the new groups are added to the
+    cached sets by climbing from the changed group, stopping at the groups already in a set, whose ancestors are
+    then in it too. Groups hold their listeners by weak references, and `close` detaches the index right away."""
+
+    def __init__(self, *groups):
+        self.groups = set()  # indexed groups
+        self.direct = dict()  # user -> set of the groups it was added to
+        self.cache = dict()  # user -> set of effective groups
+        for group in groups:
+            self.add(group)
+
+    def add(self, group):
+        """Index a group and all of its sub-groups"""
+        if group in self.groups:
+            return
+
+        known_edges = []  # (new group, sub-group indexed before)
+        self.groups.add(group)
+        stack = [group]
+        while stack:  # register the groups not indexed yet, without descending into already indexed ones
+            current = stack.pop()
+            current.add_listener(self)
+            for user in current.get_users():
+                self._add_direct(current, user)
+            for sub_group in current.get_groups():
+                if sub_group not in self.groups:
+                    self.groups.add(sub_group)
+                    stack.append(sub_group)
+                else:
+                    known_edges.append((current, sub_group))
+
+        # the new groups are ancestors of the groups they contain that were indexed before
+        for groups in self.cache.values():
+            for current, sub_group in known_edges:
+                if sub_group in groups:
+                    self._climb(groups, (current,))
+
+    def _add_direct(self, group, user):
+        self.direct.setdefault(user, set()).add(group)
+        self.cache.pop(user, None)  # recomputed on the next query
+
+    def _climb(self, result, groups):
+        """Add groups and all their indexed ancestors to the set result"""
+        stack = list(groups)
+        while stack:
+            group = stack.pop()
+            if group in result:
+                continue
+            result.add(group)
+            for parent in group.parents:
+                if parent in self.groups:
+                    stack.append(parent)
+        return result
+
+    def close(self):
+        """Stop listening to the changes of the indexed groups, and drop the index"""
+        for group in self.groups:
+            group.remove_listener(self)
+        self.groups.clear()
+        self.direct.clear()
+        self.cache.clear()
+
+    # listener callbacks, called by Group
+    def user_added(self, group, user):
+        self.direct.setdefault(user, set()).add(group)
+        if user in self.cache:
+            self._climb(self.cache[user], (group,))
+
+    def group_added(self, group, sub_group):
+        if sub_group not in self.groups:
+            self.add(sub_group)  # also climbs from the new groups, through their parent group
+            return
+        for groups in self.cache.values():
+            if sub_group in groups:
+                self._climb(groups, (group,))
+
+    def groups_of(self, user):
+        """The set of all the groups the user is in, directly or through sub-groups (not to be modified)"""
+        groups = self.cache.get(user)
+        if groups is None:
+            groups = self.cache[user] = self._climb(set(), self.direct.get(user, ()))
+        return groups
+
+
+if __name__ == "__main__":
+    import random
+
+    # Test 1: provided hierarchy
+    print("---\nTest#1")
+    parent = Group("parent")
+    child = Group("child")
+    sub_child = Group("subchild")
+    sub_child.add_user("sub_child_user")
+    child.add_group(sub_child)
+    parent.add_group(child)
+
+    index = Reverse_Index(parent)
+    print(sorted(group.get_name() for group in index.groups_of("sub_child_user")))  # ['child', 'parent', 'subchild']
+    print(index.groups_of("notpresent"))  # set()
+
+    # Test 2: cached results follow changes of the hierarchy
+    print("---\nTest#2")
+    child.add_user("child user")
+    print(sorted(group.get_name() for group in index.groups_of("child user")))  # ['child', 'parent']
+    top = Group("top")
+    top.add_group(parent)  # top is not indexed: its changes are not seen
+    other = Group("other")
+    other.add_user("child user")
+    other.add_group(parent)
+    sub_child.add_group(other)  # other is indexed with sub_child, and makes a cycle
+    print(sorted(group.get_name() for group in index.groups_of("child user")))
+    # ['child', 'other', 'parent', 'subchild']
+    print(sorted(group.get_name() for group in index.groups_of("sub_child_user")))
+    # ['child', 'other', 'parent', 'subchild']
+
+    # Test 3: the index agrees with is_user_in_group_iter on a random hierarchy, queried while it is built
+    print("---\nTest#3")
+    groups = [Group(f"group {i}") for i in range(300)]
+    index = Reverse_Index(groups[0])
+    users = [f"user {i}" for i in range(50)]
+    for i in range(1, 300):
+        groups[random.randrange(i)].add_group(groups[i])
+        if random.random() < 0.3:
+            groups[random.randrange(1, 300)].add_group(groups[i])  # maybe a cycle, or a group not indexed yet
+        groups[random.randrange(i)].add_user(random.choice(users))
+        index.groups_of(random.choice(users))
+    print(all(index.groups_of(user) == {group for group in index.groups if is_user_in_group_iter(user, group)}
+              for user in users))  # True
+
+    # Test 4: a closed index is no longer a listener of its groups
+    print("---\nTest#4")
+    index.close()
+    print(len(groups[0].listeners or ()), index.groups_of(users[0]))  # 0 set()
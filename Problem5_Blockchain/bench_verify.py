@@ -0,0 +1,36 @@
+"""Benchmark: full chain verification with 1, 2, 4 and 8 worker processes, and incremental verification of newly
+appended blocks.
+
+Usage: python bench_verify.py [n_blocks] [data_size]
+"""
+import os
+import sys
+import time
+
+from problem_5 import BlockChain
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    chain = BlockChain()
+    _, build_time = timed(lambda: [chain.append(f"{i:0{data_size}d}") for i in range(n_blocks)])
+    print(f"{n_blocks} blocks of {data_size} characters, built in {build_time:.2f}s, {os.cpu_count()} CPUs")
+
+    for workers in (1, 2, 4, 8):
+        valid, elapsed = timed(chain.verify, workers=workers)
+        assert valid
+        print(f"{workers:>4} workers: full verification in {elapsed:.2f}s")
+
+    for i in range(1000):
+        chain.append(f"new {i:0{data_size}d}")
+    valid, elapsed = timed(chain.verify, incremental=True)
+    assert valid
+    print(f"incremental verification of 1000 new blocks in {elapsed:.3f}s")
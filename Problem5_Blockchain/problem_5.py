@@ -1,7 +1,46 @@
+import bisect
 import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 
+def calc_hash(data, previous_hash, timestamp):
+    """The SHA-256 hash (hex string) of a block with the given data, previous block hash and timestamp"""
+    sha = hashlib.sha256()
+
+    # new hash is created using current block data and timestamp, as well as previous block hash
+    if previous_hash:
+        hash_str = (str(data) + str(previous_hash) + str(timestamp)).encode('utf-8')
+    else:  # if previous hash is None, do not use it to construct current hash string
+        hash_str = (str(data) + str(timestamp)).encode('utf-8')
+
+    sha.update(hash_str)
+
+    return sha.hexdigest()
+
+
+def _verify_segment(start, records):
+    """Re-hash a segment of blocks given as (data, previous hash, timestamp, hash) records, the first one at height
+    start. Returns the height of the first block whose hash does not match, None if they all match"""
+    for height, (data, previous_hash, timestamp, block_hash) in enumerate(records, start):
+        if calc_hash(data, previous_hash, timestamp) != block_hash:
+            return height
+    return None
+
+
+def _ordered_map(executor, function, items, max_pending):
+    """Like `executor.map`, but submits at most max_pending items ahead of the one being consumed, so only a few
+    segments are held in memory however long the chain is. Results come in the order of the items."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, *item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
 class Block:
     """A Blockchain block. Containing data, a timestamp of creation, and a previous block hash.
     A `calc_hash` function calculates the current block's hash code, taking into account current data,
@@ -15,17 +54,7 @@ class Block:
         self.hash = self.calc_hash()
 
     def calc_hash(self):
-        sha = hashlib.sha256()
-
-        # new hash is created using current block data and timestamp, as well as previous block hash
-        if self.previous_hash:
-            hash_str = (str(self.data) + str(self.previous_hash) + str(self.timestamp)).encode('utf-8')
-        else:  # if previous hash is None, do not use it to construct current hash string
-            hash_str = (str(self.data) + str(self.timestamp)).encode('utf-8')
-
-        sha.update(hash_str)
-
-        return sha.hexdigest()
+        return calc_hash(self.data, self.previous_hash, self.timestamp)
 
     def get_hash(self):
         return self.hash
@@ -62,11 +91,21 @@ class BlockChain(object):
     the most recent block (tail).
 
     It contains only the append method, to append a new data entry in the form of a string. This append method
-    creates a BlockChain block, and a BlockChain node and connects them appropriately."""
+    creates a BlockChain block, and a BlockChain node and connects them appropriately.
+
+    `append` also keeps indexes of the blocks by hash and by height (position in the chain, starting at 0), so a
+    block is found in O(1) instead of walking the list from `head`. The timestamps of the blocks are kept in a
+    list too: they are non-decreasing as long as the clock does not go back, and then a range of timestamps is
+    found with a binary search."""
 
     def __init__(self):
         self.head = None
         self.tail = None
+        self.blocks = []  # height -> block
+        self.heights = dict()  # block hash -> height
+        self.timestamps = []  # height -> timestamp
+        self.timestamps_sorted = True  # False once a block has an earlier timestamp than the previous one
+        self.verified = 0  # checkpoint: number of blocks from the beginning verified by `verify`
 
     def append(self, data):
         if data is None:
@@ -79,6 +118,106 @@ class BlockChain(object):
         else:  # head is empty
             self.head = self.tail = BlockChainNode(data=data, prev_node=None)
 
+        block = self.tail.block
+        if self.timestamps and block.timestamp < self.timestamps[-1]:  # the clock went back
+            self.timestamps_sorted = False
+        self.heights[block.get_hash()] = len(self.blocks)
+        self.blocks.append(block)
+        self.timestamps.append(block.timestamp)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def get_by_hash(self, block_hash):
+        """Return the block with the given hash, None if there is no such block"""
+        height = self.heights.get(block_hash)
+        return None if height is None else self.blocks[height]
+
+    def get_height(self, block_hash):
+        """Return the height of the block with the given hash, None if there is no such block"""
+        return self.heights.get(block_hash)
+
+    def get_by_height(self, height):
+        """Return the block at a height (0 is the first block, -1 the last one), None if there is no such block"""
+        if -len(self.blocks) <= height < len(self.blocks):
+            return self.blocks[height]
+        return None
+
+    def range_by_height(self, start=0, stop=None):
+        """Generator of the blocks from height start (included) to stop (excluded, default: the end of the chain)"""
+        stop = len(self.blocks) if stop is None else min(stop, len(self.blocks))
+        for height in range(max(start, 0), stop):
+            yield self.blocks[height]
+
+    def verify(self, workers=1, incremental=False, segment_size=10000):
+        """
+        Verify the chain: recompute the hash of every block, and check that each block holds the hash of the
+        previous one (and the first block none).
+
+        The links are checked in this process. The blocks are re-hashed in segments of `segment_size` blocks, in a
+        pool of `workers` processes when workers > 1 (hashing small blocks is Python-bound, so threads would not
+        help). The segments are built lazily, at most 2 * workers of them in flight. With `incremental=True`, only
+        the blocks appended since the last successful verification are checked, starting at the `verified`
+        checkpoint: changes to blocks before it are not detected.
+
+        Args:
+          workers(int): number of processes re-hashing the blocks
+          incremental(bool): verify only the blocks after the checkpoint
+          segment_size(int): number of blocks re-hashed by a worker at a time
+
+        Returns:
+           True if the chain is valid. Otherwise False, and `verified` is the height of the first invalid block
+           (a broken link or a wrong hash, whichever comes first).
+        """
+        start = self.verified if incremental else 0
+        blocks = self.blocks
+
+        # links: each block holds the hash of the previous one
+        first_invalid = len(blocks)
+        for height in range(start, len(blocks)):
+            previous_hash = blocks[height - 1].hash if height else None
+            if blocks[height].previous_hash != previous_hash:
+                first_invalid = height
+                break
+
+        # hashes: only the blocks before the first broken link can lower the first invalid height
+        segments = ((segment_start, [(block.data, block.previous_hash, block.timestamp, block.hash)
+                                     for block in blocks[segment_start:min(segment_start + segment_size,
+                                                                           first_invalid)]])
+                    for segment_start in range(start, first_invalid, segment_size))
+
+        if workers > 1 and first_invalid - start > segment_size:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                first_invalid = self._first_invalid(_ordered_map(executor, _verify_segment, segments, 2 * workers),
+                                                    first_invalid)
+        else:
+            first_invalid = self._first_invalid((_verify_segment(*segment) for segment in segments), first_invalid)
+        return self._verified_until(first_invalid)
+
+    @staticmethod
+    def _first_invalid(results, first_invalid):
+        """The first invalid height among the results of the segments, in order, or first_invalid if all are valid"""
+        for height in results:
+            if height is not None:
+                return height  # the segments come in order: the first invalid block was found
+        return first_invalid
+
+    def _verified_until(self, height):
+        self.verified = height
+        return height == len(self.blocks)
+
+    def range_by_timestamp(self, start, end):
+        """Generator of the blocks with start <= timestamp < end, in the order of the chain"""
+        if not self.timestamps_sorted:  # a binary search needs sorted timestamps, fall back to a scan
+            for block in self.blocks:
+                if start <= block.timestamp < end:
+                    yield block
+            return
+
+        first = bisect.bisect_left(self.timestamps, start)
+        last = bisect.bisect_left(self.timestamps, end)
+        yield from self.range_by_height(first, last)
+
     def __repr__(self):
 
         curr = self.head
@@ -156,3 +295,45 @@ if __name__ == "__main__":
                         |
                         V
     """
+
+    print("Test #4: Lookup by hash and by height")
+
+    myBlockChain = BlockChain()
+    for i in range(1000):
+        myBlockChain.append(f"Entry #{i}")
+
+    block = myBlockChain.get_by_height(500)
+    print(block.data, myBlockChain.get_height(block.get_hash()))  # Entry #500 500
+    print(myBlockChain.get_by_hash(block.get_hash()) is block)  # True
+    print(myBlockChain.get_by_hash("no such hash"), myBlockChain.get_by_height(1000))  # None None
+    print(myBlockChain.get_by_height(-1).data, len(myBlockChain))  # Entry #999 1000
+
+    print("Test #5: Ranges of heights and of timestamps")
+
+    print([block.data for block in myBlockChain.range_by_height(997)])  # ['Entry #997', 'Entry #998', 'Entry #999']
+    start, end = myBlockChain.blocks[10].timestamp, myBlockChain.blocks[20].timestamp
+    print(all(start <= block.timestamp < end for block in myBlockChain.range_by_timestamp(start, end)))  # True
+    print(len(list(myBlockChain.range_by_timestamp(start, end)))
+          == sum(start <= block.timestamp < end for block in myBlockChain.blocks))  # True
+    print(list(BlockChain().range_by_timestamp(start, end)))  # []
+
+    print("Test #6: Verification, in parallel and incremental")
+
+    print(myBlockChain.verify(), myBlockChain.verify(workers=2, segment_size=100))  # True True
+    print(BlockChain().verify())  # True
+    for i in range(1000, 1010):
+        myBlockChain.append(f"Entry #{i}")
+    print(myBlockChain.verify(incremental=True), myBlockChain.verified)  # True 1010
+
+    myBlockChain.get_by_height(700).data = "Tampered entry"
+    print(myBlockChain.verify(incremental=True))  # True (block 700 is before the checkpoint)
+    print(myBlockChain.verify(workers=2, segment_size=100), myBlockChain.verified)  # False 700
+
+    myBlockChain.get_by_height(700).data = "Entry #700"
+    myBlockChain.get_by_height(300).previous_hash = "broken link"
+    print(myBlockChain.verify(), myBlockChain.verified)  # False 300
+
+    myBlockChain.get_by_height(100).data = "Tampered entry"  # a wrong hash below the broken link
+    print(myBlockChain.verify(workers=2, segment_size=100), myBlockChain.verified)  # False 100
+    myBlockChain.get_by_height(300).previous_hash = myBlockChain.get_by_height(299).hash
+    print(myBlockChain.verify(incremental=True), myBlockChain.verified)  # False 100